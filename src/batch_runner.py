@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .checkpoint import apply_resume_overrides, checkpoint_path as project_checkpoint_path, get_checkpointer, select_run_thread
+
+DEFAULT_OUTPUT_ROOT = "outputs/projects"
+PROJECT_CONFIG_FILE = "project.json"  # 프로젝트별 state override (mapping_column 등, 선택)
+ROLLUP_FILE = "rollup"
+
+_INPUT_STEMS = {
+    "requirements_path": ("requirements",),
+    "testcases_path": ("testcases",),
+    "mapping_path": ("req_tc_mapping", "mapping"),
+}
+_INPUT_SUFFIXES = (".jsonl", ".json", ".csv")
+
+# 워커 프로세스마다 한 번만 만드는 그래프 (프로젝트 사이에 재사용)
+_worker: Dict[str, Any] = {}
+
+
+def project_inputs(data_dir: str) -> Dict[str, Any]:
+    """프로젝트 데이터 폴더에서 requirements / testcases / mapping 파일을 찾아 state 입력으로 만든다."""
+    base = Path(data_dir)
+    inputs: Dict[str, Any] = {}
+    for key, stems in _INPUT_STEMS.items():
+        for stem in stems:
+            found = next((base / f"{stem}{s}" for s in _INPUT_SUFFIXES if (base / f"{stem}{s}").exists()), None)
+            if found:
+                inputs[key] = str(found)
+                break
+    config = base / PROJECT_CONFIG_FILE
+    if config.exists():
+        inputs.update(json.loads(config.read_text(encoding="utf-8")))
+    missing = [k for k in ("requirements_path", "testcases_path") if k not in inputs]
+    if missing:
+        raise FileNotFoundError(f"{data_dir}: {', '.join(missing)} 파일을 찾지 못함")
+    if "mapping_path" not in inputs and "mapping_column" not in inputs:
+        raise FileNotFoundError(f"{data_dir}: req_tc_mapping 파일 또는 project.json의 mapping_column 필요")
+    return inputs
+
+
+def _init_worker(model: str, checkpoint_path: Optional[str], fake_llm: bool, embeddings: str, num_ctx: Optional[int]) -> None:
+    # import / 그래프 compile은 워커당 한 번 (프로젝트마다 프로세스를 새로 띄우지 않음)
+    from .embeddings import HashingEmbeddings
+    from .graph import build_graph
+
+    if fake_llm:
+        from .bench.fake_llm import FakeCoverageLLM
+        llm = FakeCoverageLLM()
+    else:
+        from .llm import get_llm
+        llm = get_llm(model=model, temperature=0.0, **({"num_ctx": num_ctx} if num_ctx else {}))
+
+    emb = None
+    if embeddings == "ollama":
+        from .llm import get_embeddings
+        emb = get_embeddings()
+    elif embeddings == "hashing":
+        emb = HashingEmbeddings()
+
+    # checkpoint_path가 없으면 프로젝트마다 <out>/<name>/checkpoints.sqlite (_run_project에서 붙임)
+    checkpointer = get_checkpointer(checkpoint_path) if checkpoint_path else None
+    _worker["app"] = build_graph(llm, checkpointer=checkpointer, embeddings=emb)
+    _worker["shared_checkpoint"] = checkpoint_path is not None
+
+
+def _run_project(name: str, data_dir: str, output_root: str, overrides: Dict[str, Any],
+                 review_decision: Optional[str] = None) -> Dict[str, Any]:
+    from langgraph.types import Command
+
+    from .tracing import DEFAULT_TRACE_FILE, Tracer
+
+    out_dir = Path(output_root) / name
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # compile된 그래프는 워커에서 재사용하고 checkpointer만 프로젝트 DB로 바꿔 끼움
+    checkpointer = None
+    if _worker["shared_checkpoint"]:
+        app = _worker["app"]
+    else:
+        checkpointer = get_checkpointer(project_checkpoint_path(str(out_dir)))
+        app = _worker["app"].copy(update={"checkpointer": checkpointer})
+    tracer = Tracer(str(out_dir / DEFAULT_TRACE_FILE))
+    # thread_id / output_dir를 프로젝트별로 나눠서 같은 checkpoint DB를 써도 섞이지 않게 함
+    # (thread는 run마다 새로: qtest-coverage:{name}:{run_id}, 끝나지 않은 run만 이어서 씀)
+    run_thread, snapshot = select_run_thread(app, f"qtest-coverage:{name}")
+    config = {
+        "recursion_limit": 10,
+        "configurable": {"thread_id": run_thread},
+        "callbacks": [tracer],
+    }
+    started = time.perf_counter()
+    try:
+        inputs = {
+            "objective": f"{name} 프로젝트의 Requirements와 TestCase 매핑 및 커버리지 점검",
+            "output_dir": str(out_dir),
+            "incremental": True,
+            # 모든 프로젝트의 run 이력을 한 파일에 (project 컬럼으로 구분)
+            "history_path": str(Path(output_root) / "history.sqlite"),
+            "project": name,
+            **overrides,
+            **project_inputs(data_dir),
+        }
+        # 검토 대기(interrupt) 중인 프로젝트는 review_decision으로 재개, 중간에 끊긴 프로젝트는 그 지점부터 재개
+        if snapshot is not None and snapshot.interrupts and review_decision:
+            run_input: Any = Command(resume=review_decision)
+        elif snapshot is not None:
+            # 이번 실행의 옵션(auto_approve_threshold 등)으로 재개 (데이터 입력이 바뀌었으면 error)
+            apply_resume_overrides(app, config, snapshot, inputs)
+            run_input = None
+        else:
+            run_input = inputs
+        out = app.invoke(run_input, config=config)
+        tracer.append_summary(out["report_path"])
+        # 정책으로 approve되지 않은 프로젝트는 interrupt 상태로 checkpoint에 남기고 워커는 바로 다음 프로젝트로
+        status, error = ("review" if out.get("__interrupt__") else "ok"), None
+    except Exception as e:  # 한 프로젝트 실패가 전체 배치를 멈추지 않게
+        out, status, error = {}, "error", repr(e)
+    finally:
+        tracer.close()
+        if checkpointer is not None:
+            checkpointer.close()
+
+    summary = out.get("llm_coverage", {}).get("summary", {})
+    return {
+        "project": name,
+        "status": status,
+        "error": error,
+        "pid": os.getpid(),
+        "wall_s": round(time.perf_counter() - started, 2),
+        "total": summary.get("total_requirements", 0),
+        "covered": len(out.get("covered_requirements", [])),
+        "partial": len(out.get("partial_requirements", [])),
+        "not_covered": len(out.get("uncovered_requirements", [])),
+        "unclear": len(out.get("unclear_requirements", [])),
+        "coverage_rate_strict": out.get("coverage_rate_strict"),
+        "report": out.get("report_path"),
+        "thread_id": config["configurable"]["thread_id"],
+    }
+
+
+def write_rollup(results: List[Dict[str, Any]], output_root: str) -> str:
+    """프로젝트별 strict coverage 요약(rollup.md / rollup.json)을 쓰고 markdown 경로를 돌려준다."""
+    results = sorted(results, key=lambda r: r["project"])
+    ok = [r for r in results if r["status"] != "error"]  # 검토 대기(review)도 리포트는 나온 상태
+    total = sum(r["total"] for r in ok)
+    covered = sum(r["covered"] for r in ok)
+
+    md = [
+        "# Cross-project Coverage Rollup (STRICT)\n",
+        f"- Projects: {len(ok)} ok / {len(results)}\n",
+        f"- Overall Strict Coverage: **{(covered / total * 100) if total else 0.0:.1f}%** "
+        f"({covered} / {total} requirements)\n\n",
+        "| Project | Status | Requirements | Covered | Partial | Not Covered | Unclear | Strict | Wall(s) |\n",
+        "|---|---|---:|---:|---:|---:|---:|---:|---:|\n",
+    ]
+    for r in results:
+        rate = r["coverage_rate_strict"]
+        md.append(
+            f"| {r['project']} | {r['status']} | {r['total']} | {r['covered']} | {r['partial']} "
+            f"| {r['not_covered']} | {r['unclear']} | {'-' if rate is None else f'{rate * 100:.1f}%'} "
+            f"| {r['wall_s']:.1f} |\n"
+        )
+    waiting = [r for r in results if r["status"] == "review"]
+    if waiting:
+        md.append("\n## Waiting for Review\n")
+        md.extend(f"- **{r['project']}**: thread `{r['thread_id']}`, report `{r['report']}`\n" for r in waiting)
+    errors = [r for r in results if r["status"] == "error"]
+    if errors:
+        md.append("\n## Errors\n")
+        md.extend(f"- **{r['project']}**: `{r['error']}`\n" for r in errors)
+
+    root = Path(output_root)
+    root.mkdir(parents=True, exist_ok=True)
+    (root / f"{ROLLUP_FILE}.json").write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    md_path = root / f"{ROLLUP_FILE}.md"
+    md_path.write_text("".join(md), encoding="utf-8")
+    return str(md_path)
+
+
+def run_projects(
+    data_dirs: List[str],
+    output_root: str = DEFAULT_OUTPUT_ROOT,
+    workers: Optional[int] = None,
+    model: str = "qwen3:8b",
+    checkpoint_path: Optional[str] = None,
+    fake_llm: bool = False,
+    embeddings: str = "ollama",
+    num_ctx: Optional[int] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+    auto_approve_threshold: Optional[float] = None,
+    review_decision: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """프로젝트 폴더 목록을 process pool에 나눠서 실행하고 rollup을 쓴다.
+
+    프로젝트 이름은 폴더 이름 (outputs/projects/<name>/, thread_id qtest-coverage:<name>:<run_id>).
+    auto_approve_threshold가 없으면 전부 approve, 있으면 strict coverage 미달 프로젝트는 검토 대기(review)로 남고
+    나중에 review_decision을 주고 다시 실행하면 그 결정으로 재개한다.
+    """
+    names = [Path(d).resolve().name for d in data_dirs]
+    if len(set(names)) != len(names):
+        raise ValueError("프로젝트 폴더 이름이 겹침 (출력 폴더/thread_id가 충돌)")
+    workers = workers or min(len(data_dirs), os.cpu_count() or 1)
+    if auto_approve_threshold is None:
+        review = {"review_action": "approve"}  # 야간 배치는 사람 검토 없이 진행
+    else:
+        review = {"auto_approve_threshold": auto_approve_threshold}
+    overrides = {**review, **(overrides or {})}
+
+    results: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model, checkpoint_path, fake_llm, embeddings, num_ctx),
+    ) as pool:
+        futures = {
+            pool.submit(_run_project, name, d, output_root, overrides, review_decision): name
+            for name, d in zip(names, data_dirs)
+        }
+        for fut in as_completed(futures):
+            r = fut.result()
+            results.append(r)
+            rate = r["coverage_rate_strict"]
+            print(f"[{len(results)}/{len(futures)}] {r['project']}: {r['status']} "
+                  f"strict={'-' if rate is None else f'{rate * 100:.1f}%'} ({r['wall_s']:.1f}s)")
+
+    print(f"Rollup saved to {write_rollup(results, output_root)}")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="여러 qTest 프로젝트 coverage를 process pool로 실행")
+    p.add_argument("data_dirs", nargs="+", help="프로젝트 데이터 폴더들 (requirements / testcases / req_tc_mapping)")
+    p.add_argument("--out", default=DEFAULT_OUTPUT_ROOT)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--model", default="qwen3:8b")
+    p.add_argument("--checkpoint", default=None, help="모든 프로젝트가 함께 쓸 checkpoint DB (기본: 프로젝트마다 <out>/<name>/checkpoints.sqlite)")
+    p.add_argument("--embeddings", choices=("ollama", "hashing", "none"), default="ollama")
+    p.add_argument("--num-ctx", type=int, default=None, help="Ollama context 길이 (기본 8192, max_batch_tokens + 응답보다 크게)")
+    p.add_argument("--max-concurrency", type=int, default=4, help="프로젝트(워커)당 동시 LLM 호출 수")
+    p.add_argument("--fake-llm", action="store_true", help="Ollama 없이 FakeCoverageLLM으로 실행")
+    p.add_argument("--auto-approve-threshold", type=float, default=None,
+                   help="strict coverage가 이 값(0~1) 이상인 프로젝트만 자동 approve, 나머지는 검토 대기로 남김")
+    p.add_argument("--review-decision", choices=("approve", "regenerate_report"), default=None,
+                   help="검토 대기 중인 프로젝트를 이 결정으로 재개")
+    args = p.parse_args(argv)
+
+    results = run_projects(
+        args.data_dirs,
+        output_root=args.out,
+        workers=args.workers,
+        model=args.model,
+        checkpoint_path=args.checkpoint,
+        fake_llm=args.fake_llm,
+        embeddings=args.embeddings,
+        num_ctx=args.num_ctx,
+        overrides={"max_concurrency": args.max_concurrency},
+        auto_approve_threshold=args.auto_approve_threshold,
+        review_decision=args.review_decision,
+    )
+    return 0 if all(r["status"] != "error" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
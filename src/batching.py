@@ -0,0 +1,99 @@
+import json
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from .corpus import Corpus
+
+# 한국어가 섞인 JSON 기준 보수적 추정치 (문자 2개 ≈ 토큰 1개)
+CHARS_PER_TOKEN = 2.0
+DEFAULT_MAX_BATCH_TOKENS = 6000
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def _share_order(reqs: List[dict], corpus: Corpus) -> List[dict]:
+    """TC를 공유하는 requirement끼리 인접하도록 순서를 바꾼다.
+
+    req↔tc 이분 그래프를 BFS로 돌면서, 같은 TC를 참조하는 requirement를 연달아 배치한다.
+    (tc→req 역인덱스는 corpus에 미리 계산된 것을 쓰고, 각 TC의 이웃 목록은 한 번만 펼친다)
+    """
+    pos = {r["req_id"]: i for i, r in enumerate(reqs)}
+
+    ordered: List[dict] = []
+    seen_req: Set[int] = set()
+    seen_tc: Set[str] = set()
+    for start in range(len(reqs)):
+        if start in seen_req:
+            continue
+        seen_req.add(start)
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            ordered.append(reqs[i])
+            for tc_id in corpus.mapped_tc_ids(reqs[i]["req_id"]):
+                if tc_id in seen_tc:
+                    continue
+                seen_tc.add(tc_id)
+                for rid in corpus.reqs_by_tc.get(tc_id, []):
+                    j = pos.get(rid)
+                    if j is not None and j not in seen_req:
+                        seen_req.add(j)
+                        queue.append(j)
+    return ordered
+
+
+def plan_batches(
+    reqs: List[dict],
+    corpus: Corpus,
+    max_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+    max_items: Optional[int] = None,
+    overhead_tokens: int = 0,
+    extra_tcs: Optional[Dict[str, List[str]]] = None,
+) -> List[List[dict]]:
+    """requirement + (batch 안에서 중복 제거된) 매핑 TC의 추정 토큰이 max_tokens를 넘지 않게 batch를 만든다.
+
+    - 공유 TC는 batch당 한 번만 직렬화되므로, 공유하는 requirement끼리 묶을수록 비용이 줄어든다
+    - 혼자서도 예산을 넘는 requirement는 단독 batch로 보낸다
+    - max_items가 있으면 batch당 requirement 개수도 제한 (응답 길이 제한용)
+    - extra_tcs: 매핑 외에 같이 보내는 TC (embedding 후보 등)도 예산에 포함
+    """
+    tc_tokens: Dict[str, int] = {}
+
+    def tc_cost(tc_id: str) -> int:
+        if tc_id not in tc_tokens:
+            text = corpus.tc_json(tc_id)
+            tc_tokens[tc_id] = estimate_tokens(text) if text is not None else 0
+        return tc_tokens[tc_id]
+
+    batches: List[List[dict]] = []
+    current: List[dict] = []
+    current_tcs: Set[str] = set()
+    used = overhead_tokens
+
+    for r in _share_order(reqs, corpus):
+        tc_ids = corpus.mapped_tc_ids(r["req_id"])
+        extra = extra_tcs.get(r["req_id"], []) if extra_tcs else []
+        # requirement 본문 + mapping 한 줄 (+ 후보 한 줄)
+        own = estimate_tokens(corpus.req_json(r["req_id"])) + estimate_tokens(json.dumps(tc_ids)) + 4
+        if extra:
+            own += estimate_tokens(json.dumps(extra)) + 4
+            tc_ids = tc_ids + extra
+        new_tcs = {tc_id for tc_id in tc_ids if tc_id not in current_tcs}
+        cost = own + sum(tc_cost(tc_id) for tc_id in new_tcs)
+
+        full = max_items is not None and len(current) >= max_items
+        if current and (used + cost > max_tokens or full):
+            batches.append(current)
+            current, current_tcs, used = [], set(), overhead_tokens
+            new_tcs = set(tc_ids)
+            cost = own + sum(tc_cost(tc_id) for tc_id in new_tcs)
+
+        current.append(r)
+        current_tcs |= new_tcs
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+_REQS_BLOCK = re.compile(r"requirements:\n(.*?)\n\ntestcases:", re.S)
+_REQ_LINE = re.compile(r"^REQ: (.+)$", re.M)
+_DECODER = json.JSONDecoder()
+
+
+def _json_after(text: str, label: str) -> Dict[str, Any]:
+    """"label:\n" 뒤에 오는 JSON 값 하나 (없거나 깨졌으면 {})."""
+    _, found, rest = text.partition(label + ":\n")
+    if not found:
+        return {}
+    try:
+        return _DECODER.raw_decode(rest)[0]
+    except json.JSONDecodeError:
+        return {}
+
+
+def _unit(*parts: str) -> float:
+    """입력 문자열로 정해지는 [0, 1) 값 (같은 입력이면 항상 같은 응답)."""
+    h = hashlib.sha256("|".join(parts).encode("utf-8")).digest()
+    return int.from_bytes(h[:8], "big") / 2**64
+
+
+class FakeCoverageLLM(BaseChatModel):
+    """Ollama 없이 그래프를 돌리기 위한 결정적 chat model.
+
+    EVAL_PROMPT / RECOMMEND_PROMPT / PLAN_PROMPT를 시스템 프롬프트로 구분해서
+    각 노드가 파싱할 수 있는 형태의 응답을 만든다.
+    - latency / latency_per_kb: 호출 지연(초), 프롬프트 크기에 비례하는 지연
+    - status_weights: covered / partial / not_covered / unclear 비율
+    - malformed_rate: JSON이 깨진 응답 비율 (재시도 경로 측정용)
+    - drop_rate: per_requirement에서 requirement가 빠지는 비율
+    """
+
+    model: str = "fake-coverage"
+    latency: float = 0.0
+    latency_per_kb: float = 0.0
+    status_weights: Dict[str, float] = {
+        "covered": 0.4, "partial": 0.4, "not_covered": 0.1, "unclear": 0.1,
+    }
+    malformed_rate: float = 0.0
+    drop_rate: float = 0.0
+    seed: str = "0"
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _counters: Dict[str, int] = PrivateAttr(default_factory=lambda: {
+        "calls": 0, "prompt_bytes": 0, "completion_bytes": 0,
+    })
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-coverage"
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    # --- 응답 생성 ---
+
+    def _pick_status(self, rid: str) -> str:
+        x = _unit(self.seed, "status", rid)
+        total = sum(self.status_weights.values()) or 1.0
+        acc = 0.0
+        for status, w in self.status_weights.items():
+            acc += w / total
+            if x < acc:
+                return status
+        return "unclear"
+
+    def _eval_response(self, human: str) -> Dict[str, Any]:
+        m = _REQS_BLOCK.search(human)
+        reqs = json.loads(m.group(1)) if m else []
+        mapping = _json_after(human, "req_tc_mapping")
+        candidates = _json_after(human, "candidate_tcs")
+
+        per_req: List[Dict[str, Any]] = []
+        for r in reqs:
+            rid = r["req_id"]
+            # batch 크기가 바뀌면(재질의 sub-batch) 다른 결과가 나오도록 크기도 섞음
+            if _unit(self.seed, "drop", rid, str(len(reqs))) < self.drop_rate:
+                continue
+            status = self._pick_status(rid)
+            per_req.append({
+                "req_id": rid,
+                "status": status,
+                # 후보 TC는 첫 번째 것만 채택한 것처럼 응답
+                "matched_tc_ids": mapping.get(rid, []) + candidates.get(rid, [])[:1],
+                "gaps": [] if status == "covered" else [f"{rid} 경계조건 검증 누락", "실패 케이스 검증 누락"],
+                "notes": "synthetic",
+                "confidence": round(0.5 + _unit(self.seed, "conf", self.model, rid) / 2, 2),
+            })
+        return {"per_requirement": per_req}
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        system = messages[0].content if messages else ""
+        human = messages[-1].content if messages else ""
+        if "커버리지 리뷰어" in system:
+            body = json.dumps(self._eval_response(human), ensure_ascii=False)
+        elif "테스트 설계" in system:
+            m = _REQ_LINE.search(human)
+            rid = m.group(1) if m else "REQ"
+            body = json.dumps({"items": [{
+                "title": f"{rid} 경계값 검증",
+                "purpose": "누락된 경계조건 보완",
+                "suggested_steps": ["사전 조건 준비", "경계값 입력", "결과 확인"],
+                "expected": "정의된 오류/제한이 적용된다",
+            }]}, ensure_ascii=False)
+        else:
+            body = "\n".join(f"- 단계 {i}" for i in range(1, 7))
+
+        if _unit(self.seed, "malformed", human) < self.malformed_rate:
+            body = "<think>...</think>\n" + body[: len(body) // 2]
+        return body
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        prompt_bytes = sum(len(str(m.content).encode("utf-8")) for m in messages)
+        text = self._respond(messages)
+        completion_bytes = len(text.encode("utf-8"))
+        with self._lock:
+            self._counters["calls"] += 1
+            self._counters["prompt_bytes"] += prompt_bytes
+            self._counters["completion_bytes"] += completion_bytes
+        # Ollama와 같은 키로 토큰 수 흉내 (대략 bytes / 3)
+        message = AIMessage(
+            content=text,
+            response_metadata={
+                "model": self.model,
+                "prompt_eval_count": prompt_bytes // 3,
+                "eval_count": completion_bytes // 3,
+            },
+            usage_metadata={
+                "input_tokens": prompt_bytes // 3,
+                "output_tokens": completion_bytes // 3,
+                "total_tokens": (prompt_bytes + completion_bytes) // 3,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _delay(self, messages: List[BaseMessage]) -> float:
+        size_kb = sum(len(str(m.content).encode("utf-8")) for m in messages) / 1024
+        return self.latency + self.latency_per_kb * size_kb
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        delay = self._delay(messages)
+        if delay:
+            time.sleep(delay)
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        delay = self._delay(messages)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._result(messages)
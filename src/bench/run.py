@@ -0,0 +1,150 @@
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..embeddings import HashingEmbeddings
+from ..graph import build_graph
+from .fake_llm import FakeCoverageLLM
+from .synthetic import SIZES, generate_corpus
+
+# CI 회귀 비교 대상 지표 (calls / bytes는 결정적이라 엄격하게, 시간/메모리는 tolerance 적용)
+_EXACT_METRICS = ("calls", "prompt_bytes")
+_TOLERANT_METRICS = ("wall_s", "peak_rss_mb")
+
+
+def _peak_rss_mb() -> float:
+    # Linux: KB, macOS: bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(corpus: Dict[str, str], llm: FakeCoverageLLM, work_dir: str,
+                  overrides: Optional[Dict[str, Any]] = None, embeddings=None) -> Dict[str, Any]:
+    """합성 corpus로 build_graph 전체를 headless로 실행하고 노드별 지표를 모은다.
+
+    노드는 순서대로 실행되므로, stream(updates)의 이벤트 사이 시간/카운터 차이를 노드 비용으로 본다.
+    peak_rss_mb는 그 노드가 끝난 시점까지의 프로세스 최고 RSS.
+    """
+    app = build_graph(llm, embeddings=embeddings)
+    state = {
+        "objective": "benchmark",
+        "output_dir": work_dir,
+        "use_cache": False,
+        "embedding_cache_path": str(Path(work_dir) / "embeddings.sqlite"),
+        "review_action": "approve",  # human_review의 input() 우회
+        **corpus,
+        **(overrides or {}),
+    }
+    config = {"configurable": {"thread_id": "bench"}, "recursion_limit": 25}
+
+    nodes: List[Dict[str, Any]] = []
+    started = last = time.perf_counter()
+    last_counters = llm.counters
+    for event in app.stream(state, config=config, stream_mode="updates"):
+        now = time.perf_counter()
+        counters = llm.counters
+        for node in event:
+            nodes.append({
+                "node": node,
+                "wall_s": round(now - last, 4),
+                "calls": counters["calls"] - last_counters["calls"],
+                "prompt_bytes": counters["prompt_bytes"] - last_counters["prompt_bytes"],
+                "completion_bytes": counters["completion_bytes"] - last_counters["completion_bytes"],
+                "peak_rss_mb": round(_peak_rss_mb(), 1),
+            })
+        last, last_counters = now, counters
+
+    total = llm.counters
+    return {
+        "nodes": nodes,
+        "total": {
+            "wall_s": round(time.perf_counter() - started, 4),
+            "calls": total["calls"],
+            "prompt_bytes": total["prompt_bytes"],
+            "completion_bytes": total["completion_bytes"],
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        },
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """baseline보다 나빠진 지표 목록 (비어 있으면 통과)."""
+    problems = []
+    cur, base = result["total"], baseline["total"]
+    for k in _EXACT_METRICS:
+        if cur[k] > base[k]:
+            problems.append(f"{k}: {base[k]} -> {cur[k]}")
+    for k in _TOLERANT_METRICS:
+        if cur[k] > base[k] * (1 + tolerance):
+            problems.append(f"{k}: {base[k]} -> {cur[k]} (> +{tolerance * 100:.0f}%)")
+    return problems
+
+
+def _print_table(result: Dict[str, Any]) -> None:
+    print(f"{'node':<20} {'wall_s':>9} {'calls':>7} {'prompt_KB':>10} {'peak_rss_MB':>12}")
+    for row in result["nodes"] + [{"node": "TOTAL", **result["total"]}]:
+        print(
+            f"{row['node']:<20} {row['wall_s']:>9.3f} {row['calls']:>7} "
+            f"{row['prompt_bytes'] / 1024:>10.1f} {row['peak_rss_mb']:>12.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Offline coverage pipeline benchmark (fake LLM)")
+    p.add_argument("--size", default="1k", help="1k / 10k / 100k 또는 requirement 개수")
+    p.add_argument("--testcases", type=int, default=0, help="TC 개수 (기본: requirement 수와 동일)")
+    p.add_argument("--latency", type=float, default=0.0, help="LLM 호출당 지연(초)")
+    p.add_argument("--latency-per-kb", type=float, default=0.0)
+    p.add_argument("--malformed-rate", type=float, default=0.0)
+    p.add_argument("--drop-rate", type=float, default=0.0)
+    p.add_argument("--max-concurrency", type=int, default=4)
+    p.add_argument("--batch-size", type=int, default=30)
+    p.add_argument("--max-batch-tokens", type=int, default=6000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--embeddings", action="store_true", help="HashingEmbeddings로 후보 TC 제안 단계 포함")
+    p.add_argument("--out", help="결과 JSON 저장 경로")
+    p.add_argument("--baseline", help="비교할 이전 결과 JSON (나빠지면 exit 1)")
+    p.add_argument("--tolerance", type=float, default=0.2, help="시간/메모리 허용 증가율")
+    args = p.parse_args(argv)
+
+    n = SIZES.get(args.size) or int(args.size)
+    llm = FakeCoverageLLM(
+        latency=args.latency,
+        latency_per_kb=args.latency_per_kb,
+        malformed_rate=args.malformed_rate,
+        drop_rate=args.drop_rate,
+        seed=str(args.seed),
+    )
+
+    with tempfile.TemporaryDirectory(prefix="coverage-bench-") as tmp:
+        t0 = time.perf_counter()
+        corpus = generate_corpus(str(Path(tmp) / "data"), n, args.testcases, seed=args.seed)
+        print(f"corpus: {n} requirements generated in {time.perf_counter() - t0:.2f}s")
+        result = run_benchmark(corpus, llm, str(Path(tmp) / "outputs"), {
+            "batch_size": args.batch_size,
+            "max_batch_tokens": args.max_batch_tokens,
+            "max_concurrency": args.max_concurrency,
+        }, embeddings=HashingEmbeddings() if args.embeddings else None)
+
+    result["params"] = vars(args)
+    _print_table(result)
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        problems = compare(result, baseline, args.tolerance)
+        if problems:
+            print("REGRESSION:\n  " + "\n  ".join(problems))
+            return 1
+        print("OK: no regression against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import json
+import random
+from pathlib import Path
+from typing import Dict
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+_COMPONENTS = ["Auth", "AuthZ", "Profile", "Post", "Payment", "Search", "Admin", "Notification"]
+_VERBS = ["생성", "조회", "수정", "삭제", "검증", "전송", "승인", "취소"]
+
+
+def generate_corpus(
+    out_dir: str,
+    n_requirements: int,
+    n_testcases: int = 0,
+    seed: int = 0,
+    unmapped_ratio: float = 0.25,
+    max_tcs_per_req: int = 6,
+    hub_tcs: int = 5,
+) -> Dict[str, str]:
+    """requirements.jsonl / testcases.jsonl / req_tc_mapping.json 합성 데이터 생성.
+
+    - unmapped_ratio: 매핑이 비어 있는 requirement 비율
+    - hub_tcs: 여러 requirement가 공유하는 TC 개수 (공유 TC 분석/batch 묶음 측정용)
+    행 단위로 파일에 바로 쓰므로 100k 규모도 메모리에 전체 목록을 만들지 않는다.
+    """
+    rng = random.Random(seed)
+    n_testcases = n_testcases or n_requirements
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "requirements_path": str(out / "requirements.jsonl"),
+        "testcases_path": str(out / "testcases.jsonl"),
+        "mapping_path": str(out / "req_tc_mapping.json"),
+    }
+
+    with open(paths["testcases_path"], "w", encoding="utf-8") as f:
+        for j in range(n_testcases):
+            comp = _COMPONENTS[j % len(_COMPONENTS)]
+            verb = _VERBS[rng.randrange(len(_VERBS))]
+            steps = [f"{comp} 화면 진입", f"테스트 데이터 {j} 입력"] + [
+                f"{verb} 단계 {k}" for k in range(rng.randint(1, 6))
+            ]
+            f.write(json.dumps({
+                "tc_id": f"TC-{j:06d}",
+                "title": f"{comp} {verb} 확인 #{j}",
+                "steps": steps,
+                "expected": f"{verb} 결과가 정상적으로 반영된다 (#{j})",
+            }, ensure_ascii=False) + "\n")
+
+    hubs = [f"TC-{j:06d}" for j in range(min(hub_tcs, n_testcases))]
+    with open(paths["requirements_path"], "w", encoding="utf-8") as rf, \
+            open(paths["mapping_path"], "w", encoding="utf-8") as mf:
+        mf.write("{\n")
+        for i in range(n_requirements):
+            rid = f"REQ-{i:06d}"
+            comp = _COMPONENTS[i % len(_COMPONENTS)]
+            verb = _VERBS[rng.randrange(len(_VERBS))]
+            rf.write(json.dumps({
+                "req_id": rid,
+                "title": f"사용자는 {comp} 항목을 {verb}할 수 있어야 한다 #{i}",
+                "description": f"{comp} {verb} 시 입력값 검증, 권한 확인, 실패 시 오류 메시지를 표시한다. " * rng.randint(1, 3),
+            }, ensure_ascii=False) + "\n")
+
+            if rng.random() < unmapped_ratio:
+                tc_ids = []
+            else:
+                # 주변 TC 몇 개 + 가끔 hub TC
+                k = rng.randint(1, max_tcs_per_req)
+                base = (i * n_testcases) // n_requirements
+                tc_ids = sorted({f"TC-{(base + rng.randrange(20)) % n_testcases:06d}" for _ in range(k)})
+                if hubs and rng.random() < 0.1:
+                    tc_ids.append(hubs[rng.randrange(len(hubs))])
+                # 가끔 존재하지 않는 TC를 가리키는 매핑
+                if rng.random() < 0.02:
+                    tc_ids.append(f"TC-MISSING-{i}")
+            sep = ",\n" if i < n_requirements - 1 else "\n"
+            mf.write(f"  {json.dumps(rid)}: {json.dumps(tc_ids)}{sep}")
+        mf.write("}\n")
+
+    return paths
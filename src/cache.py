@@ -0,0 +1,168 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .sqlite_store import connect, select_in
+
+DEFAULT_CACHE_PATH = "outputs/cache/llm_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 200_000
+DEFAULT_MAX_AGE_DAYS = 30.0
+
+
+def stable_hash(*parts: Any) -> str:
+    """dict/list 등을 key 순서와 무관하게 직렬화해서 sha256 hex로 만든다."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """LLM 응답(JSON 값)을 content hash로 저장하는 SQLite 캐시.
+
+    - namespace로 용도(verdict, recommendation 등)를 구분
+    - max_age_days보다 오래 사용되지 않은 항목, max_entries를 넘는 오래된 항목은 evict()에서 삭제
+    - hits / misses 카운터는 인스턴스 단위로 집계
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        namespace: str = "verdict",
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+        max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " used_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_used ON llm_cache(namespace, used_at)")
+        self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Any] = {}
+        now = time.time()
+        with self._lock:
+            rows = list(select_in(
+                self._conn, "SELECT key, value FROM llm_cache WHERE namespace = ? AND key IN ({marks})",
+                [self.namespace], keys,
+            ))
+            for k, v in rows:
+                found[k] = json.loads(v)
+            if rows:
+                self._conn.executemany(
+                    "UPDATE llm_cache SET used_at = ? WHERE namespace = ? AND key = ?",
+                    [(now, self.namespace, k) for k, _ in rows],
+                )
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Iterable[Tuple[str, Any]]) -> None:
+        now = time.time()
+        rows = [
+            (self.namespace, k, json.dumps(v, ensure_ascii=False), now, now)
+            for k, v in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO llm_cache (namespace, key, value, created_at, used_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many([(key, value)])
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM llm_cache WHERE namespace = ? AND key = ?",
+                [(self.namespace, k) for k in keys],
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """오래된 항목(age) → 넘치는 항목(size) 순으로 삭제하고 삭제 개수를 돌려준다."""
+        removed = 0
+        with self._lock:
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                cur = self._conn.execute(
+                    "DELETE FROM llm_cache WHERE namespace = ? AND used_at < ?",
+                    (self.namespace, cutoff),
+                )
+                removed += cur.rowcount
+            if self.max_entries is not None:
+                cur = self._conn.execute(
+                    "DELETE FROM llm_cache WHERE namespace = ? AND key IN ("
+                    " SELECT key FROM llm_cache WHERE namespace = ?"
+                    " ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.namespace, self.namespace, self.max_entries),
+                )
+                removed += cur.rowcount
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (size,) = self._conn.execute(
+                "SELECT COUNT(*) FROM llm_cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_cache(state: Dict[str, Any], namespace: str) -> Optional[LLMCache]:
+    """state의 cache 옵션으로 캐시를 연다. use_cache=False면 None."""
+    if not state.get("use_cache", True):
+        return None
+    return LLMCache(
+        path=state.get("cache_path") or DEFAULT_CACHE_PATH,
+        namespace=namespace,
+        max_entries=state.get("cache_max_entries", DEFAULT_MAX_ENTRIES),
+        max_age_days=state.get("cache_max_age_days", DEFAULT_MAX_AGE_DAYS),
+    )
+
+
+def model_name(llm) -> str:
+    return getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm).__name__
+
+
+def prompt_text(prompt) -> str:
+    """ChatPromptTemplate의 템플릿 원문(프롬프트가 바뀌면 캐시 키도 바뀌도록)."""
+    return "\n".join(
+        f"{type(m).__name__}:{getattr(getattr(m, 'prompt', None), 'template', m)}"
+        for m in prompt.messages
+    )
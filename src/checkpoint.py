@@ -0,0 +1,442 @@
+import hashlib
+import random
+import threading
+from collections.abc import AsyncIterator, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+from .history import new_run_id
+from .sqlite_store import connect
+
+CHECKPOINT_FILE = "checkpoints.sqlite"
+DEFAULT_CHECKPOINT_PATH = f"outputs/{CHECKPOINT_FILE}"
+DEFAULT_KEEP_RUNS = 5  # base thread마다 남겨 둘 최근 run thread 수 (나머지는 새 run을 시작할 때 삭제)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    hash TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_hash TEXT NOT NULL,
+    metadata_hash TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS channel_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    hash TEXT,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """디스크(SQLite) 기반 checkpointer.
+
+    - 채널 값/쓰기 값은 직렬화한 bytes의 sha256으로 payloads 테이블에 한 번만 저장
+      (revise_plan 루프에서 같은 corpus를 다시 써도 추가 저장 없음)
+    - checkpoint에는 값 대신 (channel, version) → hash 참조만 남기고,
+      LangGraph가 넘겨주는 new_versions(바뀐 채널)만 기록
+    - 프로세스가 죽어도 같은 thread_id로 invoke(None, config)하면 마지막 checkpoint부터 재개
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, *, serde=None):
+        super().__init__(serde=serde)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # --- payload (content-addressed) ---
+
+    def _put_payload(self, value: Any) -> str:
+        type_, data = self.serde.dumps_typed(value)
+        h = hashlib.sha256(type_.encode("utf-8") + b"\0" + data).hexdigest()
+        self._conn.execute(
+            "INSERT OR IGNORE INTO payloads (hash, type, data) VALUES (?, ?, ?)",
+            (h, type_, data),
+        )
+        return h
+
+    def _load_payload(self, h: str) -> Any:
+        type_, data = self._conn.execute(
+            "SELECT type, data FROM payloads WHERE hash = ?", (h,)
+        ).fetchone()
+        return self.serde.loads_typed((type_, data))
+
+    # --- read ---
+
+    def _load_channel_values(self, thread_id: str, checkpoint_ns: str,
+                             versions: ChannelVersions) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for channel, version in versions.items():
+            row = self._conn.execute(
+                "SELECT hash FROM channel_blobs"
+                " WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if row is None or row[0] is None:
+                continue
+            values[channel] = self._load_payload(row[0])
+        return values
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row: Tuple) -> CheckpointTuple:
+        checkpoint_id, parent_id, checkpoint_hash, metadata_hash = row
+        checkpoint: Checkpoint = self._load_payload(checkpoint_hash)
+        writes = self._conn.execute(
+            "SELECT task_id, channel, hash FROM writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+            " ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(
+                    thread_id, checkpoint_ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=self._load_payload(metadata_hash),
+            pending_writes=[(tid, ch, self._load_payload(h)) for tid, ch, h in writes],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, checkpoint_hash, metadata_hash"
+            " FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: List[Any] = [thread_id, checkpoint_ns]
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            return self._to_tuple(thread_id, checkpoint_ns, row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,"
+            " checkpoint_hash, metadata_hash FROM checkpoints WHERE 1 = 1"
+        )
+        params: List[Any] = []
+        if config:
+            query += " AND thread_id = ?"
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                query += " AND checkpoint_ns = ?"
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query += " AND checkpoint_id < ?"
+            params.append(before_id)
+        query += " ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            with self._lock:
+                item = self._to_tuple(thread_id, checkpoint_ns, tuple(row))
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield item
+
+    # --- write ---
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        c = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+
+        with self._lock:
+            # 바뀐 채널만 기록 (값은 hash 참조)
+            for channel, version in new_versions.items():
+                h = self._put_payload(values[channel]) if channel in values else None
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO channel_blobs"
+                    " (thread_id, checkpoint_ns, channel, version, hash) VALUES (?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, channel, str(version), h),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints"
+                " (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,"
+                " checkpoint_hash, metadata_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    self._put_payload(c),
+                    self._put_payload(get_checkpoint_metadata(config, metadata)),
+                ),
+            )
+            self._conn.commit()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        with self._lock:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                # 특수 채널(에러/인터럽트 등)은 덮어쓰고, 일반 쓰기는 처음 것만 유지
+                verb = "INSERT OR REPLACE" if write_idx < 0 else "INSERT OR IGNORE"
+                self._conn.execute(
+                    f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id,"
+                    " idx, channel, hash, task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint_id, task_id, write_idx,
+                     channel, self._put_payload(value), task_path),
+                )
+            self._conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.delete_threads([thread_id])
+
+    def delete_threads(self, thread_ids: Sequence[str]) -> None:
+        # 여러 thread를 한 transaction으로 지우고 payload 정리도 한 번만
+        with self._lock:
+            for thread_id in thread_ids:
+                for table in ("checkpoints", "channel_blobs", "writes"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self._gc()
+            self._conn.commit()
+
+    def _gc(self) -> None:
+        # 어디에서도 참조하지 않는 payload 정리
+        self._conn.execute(
+            "DELETE FROM payloads WHERE hash NOT IN ("
+            " SELECT hash FROM channel_blobs WHERE hash IS NOT NULL"
+            " UNION SELECT hash FROM writes"
+            " UNION SELECT checkpoint_hash FROM checkpoints"
+            " UNION SELECT metadata_hash FROM checkpoints)"
+        )
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # --- async (SQLite 호출이 짧으므로 sync 구현에 위임) ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        return self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return self.delete_thread(thread_id)
+
+    def threads(self, prefix: str) -> List[str]:
+        """prefix로 시작하는 thread_id (최신 run부터)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT thread_id FROM checkpoints WHERE substr(thread_id, 1, ?) = ?"
+                " ORDER BY thread_id DESC",
+                (len(prefix), prefix),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def get_checkpointer(path: Optional[str] = None) -> BaseCheckpointSaver:
+    """path가 있으면 SQLite checkpointer, 없으면 기존처럼 MemorySaver."""
+    return SqliteCheckpointSaver(path) if path else MemorySaver()
+
+
+def checkpoint_path(output_dir: str) -> str:
+    # 프로젝트(output_dir)마다 checkpoint DB를 따로 둔다
+    return str(Path(output_dir) / CHECKPOINT_FILE)
+
+
+def new_run_thread(base: str) -> str:
+    """실행마다 새 thread_id (base:run_id). 같은 thread를 다시 쓰면 이전 실행의 채널 값
+    (review_action, candidate_tcs, 경로 등)이 입력에 없는 key로 그대로 남기 때문."""
+    return f"{base}:{new_run_id()}"
+
+
+def run_threads(checkpointer: BaseCheckpointSaver, base: str) -> List[str]:
+    """base 아래 run thread들, 최신 run부터 (run_id가 시간순이라 문자열 역순)."""
+    prefix = f"{base}:"
+    if isinstance(checkpointer, SqliteCheckpointSaver):
+        return checkpointer.threads(prefix)
+    threads = {t.config["configurable"]["thread_id"] for t in checkpointer.list(None)}
+    return sorted((t for t in threads if t.startswith(prefix)), reverse=True)
+
+
+def latest_run_thread(checkpointer: BaseCheckpointSaver, base: str) -> Optional[str]:
+    """base 아래 가장 최근 run thread. 없으면 None."""
+    threads = run_threads(checkpointer, base)
+    return threads[0] if threads else None
+
+
+def prune_run_threads(checkpointer: BaseCheckpointSaver, base: str, keep: int = DEFAULT_KEEP_RUNS) -> int:
+    """최근 keep개를 빼고 base 아래 run thread를 지운다 (지운 수를 돌려줌).
+
+    재개 대상은 마지막 run뿐이라 그보다 오래된 thread는 끝났거나 버려진 run이다.
+    """
+    old = run_threads(checkpointer, base)[max(0, keep):]
+    if isinstance(checkpointer, SqliteCheckpointSaver):
+        checkpointer.delete_threads(old)
+    else:
+        for thread_id in old:
+            checkpointer.delete_thread(thread_id)
+    return len(old)
+
+
+def select_run_thread(app, base: str, keep: int = DEFAULT_KEEP_RUNS) -> Tuple[str, Any]:
+    """base의 마지막 run이 끝나지 않았으면(interrupt / 중간 종료) (그 thread_id, snapshot),
+    아니면 (새 run thread_id, None). 새 run을 시작할 때는 이번 run을 포함해 최근 keep개만 남긴다."""
+    latest = latest_run_thread(app.checkpointer, base)
+    if latest:
+        snapshot = app.get_state({"configurable": {"thread_id": latest}})
+        if snapshot.next:
+            return latest, snapshot
+    prune_run_threads(app.checkpointer, base, keep - 1)
+    return new_run_thread(base), None
+
+
+# 이미 읽어 들인 데이터를 정하는 입력: 재개할 run과 다르면 이어서 돌릴 수 없음
+RUN_DATA_KEYS = ("requirements_path", "testcases_path", "mapping_path", "mapping_column", "output_dir")
+
+
+def apply_resume_overrides(app, config: RunnableConfig, snapshot: Any, overrides: Dict[str, Any]) -> None:
+    """재개 전에 이번 실행의 override(review_action, auto_approve_threshold 등)를 checkpoint state에 반영한다.
+
+    데이터 입력(RUN_DATA_KEYS)이 재개할 run과 다르면 ValueError.
+    반영하면 next가 마지막으로 끝난 노드 기준으로 다시 정해지므로, human_review에서 멈춘 run은
+    human_review부터 새 정책으로 다시 판단한다.
+    """
+    values = snapshot.values
+    conflicts = [k for k in RUN_DATA_KEYS if k in overrides and overrides[k] != values.get(k)]
+    if conflicts:
+        thread_id = config["configurable"]["thread_id"]
+        raise ValueError(
+            f"끝나지 않은 run {thread_id}과 입력이 다름 ({', '.join(conflicts)}). "
+            "그 run을 이어서 돌리려면 같은 입력으로, 새로 시작하려면 다른 thread_id로 실행"
+        )
+    changed = {k: v for k, v in overrides.items() if values.get(k) != v}
+    if changed:
+        app.update_state(config, changed)
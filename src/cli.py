@@ -0,0 +1,131 @@
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+# 이 모듈은 argparse만 import한다. langchain / langgraph / pandas 등은 서브커맨드 안에서 필요할 때만
+# (validate / --help는 LLM 스택을 import하지 않아 cron에서 바로 끝남)
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    overrides = {"output_dir": args.output_dir}
+    for key in ("requirements_path", "testcases_path", "mapping_path", "mapping_column", "auto_approve_threshold"):
+        if getattr(args, key) is not None:
+            overrides[key] = getattr(args, key)
+    if args.review_action:
+        overrides["review_action"] = args.review_action
+
+    kwargs = {
+        "model": args.model,
+        "thread_id": args.thread_id,
+        "overrides": overrides,
+        "use_embeddings": not args.no_embeddings,
+    }
+    if args.use_async:
+        import asyncio
+
+        from .main import amain
+        asyncio.run(amain(**kwargs))
+    else:
+        from .main import main
+        main(**kwargs)
+    return 0
+
+
+def _cmd_visualize(args: argparse.Namespace) -> int:
+    from .visualize_graph import render_graph
+
+    render_graph(args.out, png=args.png, with_candidates=not args.no_candidates)
+    return 0
+
+
+def _cmd_validate(args: argparse.Namespace) -> int:
+    from .loaders import load_corpus, validate_corpus
+
+    result = validate_corpus(*load_corpus(
+        requirements_path=args.requirements_path,
+        testcases_path=args.testcases_path,
+        mapping_path=args.mapping_path,
+        mapping_column=args.mapping_column,
+    ))
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        stats = result["stats"]
+        print(f"requirements={stats['requirements']} testcases={stats['testcases']} "
+              f"mapping_edges={stats['mapping_edges']}")
+        for level in ("errors", "warnings"):
+            for issue in result[level]:
+                more = issue["count"] - len(issue["ids"])
+                print(f"[{level[:-1]}] {issue['message']}: {issue['count']} "
+                      f"({', '.join(issue['ids'])}{f' … (+{more})' if more > 0 else ''})")
+    if result["errors"]:
+        return 1
+    return 1 if args.strict and result["warnings"] else 0
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    from .bench.run import main as bench_main
+
+    return bench_main(args.bench_args)
+
+
+def _add_data_args(p: argparse.ArgumentParser, with_defaults: bool) -> None:
+    # run은 None이면 load_data의 기본 경로를 쓰므로 기본값을 두지 않음
+    p.add_argument("--requirements", dest="requirements_path",
+                   default="data/requirements.json" if with_defaults else None)
+    p.add_argument("--testcases", dest="testcases_path",
+                   default="data/testcases.json" if with_defaults else None)
+    p.add_argument("--mapping", dest="mapping_path",
+                   default="data/req_tc_mapping.json" if with_defaults else None)
+    p.add_argument("--mapping-column", default=None, help="매핑 파일 대신 export 컬럼에서 매핑 생성")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m src", description="qTest requirement coverage 도구")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="coverage 그래프 실행 (Ollama 필요)")
+    _add_data_args(run, with_defaults=False)
+    run.add_argument("--model", default="qwen3:8b")
+    run.add_argument("--thread-id", default="qtest-coverage-001", help="checkpoint thread 접두어 (run마다 <값>:<run_id>, 끝나지 않은 마지막 run은 재개)")
+    run.add_argument("--output-dir", default="outputs")
+    run.add_argument("--async", dest="use_async", action="store_true", help="astream으로 batch 진행 상황 출력")
+    run.add_argument("--no-embeddings", action="store_true", help="후보 TC 제안(embedding) 단계 생략")
+    run.add_argument("--review-action", choices=("approve",), default=None,
+                     help="검토 없이 이 action으로 진행 (headless)")
+    run.add_argument("--auto-approve-threshold", type=float, default=None,
+                     help="strict coverage가 이 값 이상이면 자동 approve")
+    run.set_defaults(func=_cmd_run)
+
+    vis = sub.add_parser("visualize", help="그래프 구조를 Mermaid로 저장 (LLM 불필요)")
+    vis.add_argument("--out", default="outputs/graph.mmd")
+    vis.add_argument("--png", action="store_true", help="mermaid PNG도 시도 (네트워크 필요)")
+    vis.add_argument("--no-candidates", action="store_true", help="suggest_candidates 노드 없이 그림")
+    vis.set_defaults(func=_cmd_visualize)
+
+    val = sub.add_parser("validate", help="입력 데이터 정합성 점검 (LLM 불필요, 오류면 exit 1)")
+    _add_data_args(val, with_defaults=True)
+    val.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    val.add_argument("--strict", action="store_true", help="warning도 실패로 처리")
+    val.set_defaults(func=_cmd_validate)
+
+    bench = sub.add_parser("bench", help="합성 데이터 벤치마크 (src.bench.run 옵션을 그대로 전달)",
+                           add_help=False)
+    bench.set_defaults(func=_cmd_bench)
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    # bench 옵션은 src.bench.run이 직접 파싱 (bench -h도 그쪽 도움말)
+    if args.command == "bench":
+        args.bench_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import json
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .cache import stable_hash
+from .incremental import input_fingerprints
+
+_REGISTRY_SIZE = 4
+# TC JSON 캐시 크기 (corpus당). 여러 batch에 반복해서 들어가는 공유 TC만 재사용하면 되므로 전체를 들고 있지 않음
+TC_JSON_CACHE_SIZE = 4096
+
+
+class Corpus:
+    """load_data에서 한 번 만들고 노드들이 같이 쓰는 인덱스된 corpus.
+
+    - requirements / testcases 원본 dict는 state(checkpoint)에 있는 것을 그대로 공유 (복사 없음).
+      레코드를 별도 타입으로 바꾸면 state의 dict와 두 벌이 되므로 바꾸지 않고, ID만 intern해서 공유
+    - req_by_id / tc_by_id, req→tc(매핑 원본 순서), tc→req 역인덱스를 미리 계산
+    - TC JSON 직렬화는 최근 TC_JSON_CACHE_SIZE개만 LRU로 캐시
+      (공유 TC를 batch마다 json.dumps 하지 않되, corpus 전체의 직렬화 사본은 들고 있지 않음)
+    """
+
+    __slots__ = (
+        "corpus_id", "requirements", "testcases", "mapping", "fingerprints",
+        "req_ids", "tc_ids", "req_by_id", "tc_by_id", "reqs_by_tc",
+        "_tc_json",
+    )
+
+    def __init__(self, requirements: List[dict], testcases: List[dict],
+                 mapping: Dict[str, List[str]], fingerprints: Optional[Dict[str, Any]] = None):
+        self.requirements = requirements
+        self.testcases = testcases
+        self.fingerprints = fingerprints or input_fingerprints(requirements, testcases, mapping)
+        self.corpus_id = stable_hash(self.fingerprints)
+
+        # 레코드 안의 ID도 intern된 문자열로 바꿔서 인덱스 / 매핑과 같은 객체를 가리키게 함
+        for r in requirements:
+            r["req_id"] = sys.intern(r["req_id"])
+        for tc in testcases:
+            tc["tc_id"] = sys.intern(tc["tc_id"])
+        self.req_ids: List[str] = [r["req_id"] for r in requirements]
+        self.tc_ids: List[str] = [tc["tc_id"] for tc in testcases]
+        self.req_by_id: Dict[str, dict] = dict(zip(self.req_ids, requirements))
+        self.tc_by_id: Dict[str, dict] = dict(zip(self.tc_ids, testcases))
+
+        self.mapping: Dict[str, List[str]] = {}  # req→tc 원본 순서 (없는 TC ID 포함)
+        self.reqs_by_tc: Dict[str, List[str]] = {}
+        for rid, tc_ids in mapping.items():
+            rid = sys.intern(rid)
+            interned = [sys.intern(t) for t in tc_ids]
+            self.mapping[rid] = interned
+            for tc_id in interned:
+                self.reqs_by_tc.setdefault(tc_id, []).append(rid)
+
+        self._tc_json = lru_cache(maxsize=TC_JSON_CACHE_SIZE)(self._dump_tc)
+
+    def mapped_tc_ids(self, rid: str) -> List[str]:
+        return self.mapping.get(rid, [])
+
+    def known_tc_ids(self, rid: str) -> List[str]:
+        return [t for t in self.mapping.get(rid, []) if t in self.tc_by_id]
+
+    def req_hash(self, rid: str) -> Optional[str]:
+        return self.fingerprints["requirements"].get(rid)
+
+    def tc_hash(self, tc_id: str) -> Optional[str]:
+        return self.fingerprints["testcases"].get(tc_id)
+
+    # --- JSON 직렬화 (프롬프트 생성용) ---
+
+    def _dump_tc(self, tc_id: str) -> Optional[str]:
+        tc = self.tc_by_id.get(tc_id)
+        return json.dumps(tc, ensure_ascii=False) if tc is not None else None
+
+    def req_json(self, rid: str) -> str:
+        # requirement는 자기 batch에만 들어가므로 캐시하지 않음
+        return json.dumps(self.req_by_id[rid], ensure_ascii=False)
+
+    def tc_json(self, tc_id: str) -> Optional[str]:
+        return self._tc_json(tc_id)
+
+    def reqs_json(self, rids: List[str]) -> str:
+        # json.dumps(list)와 같은 문자열 (", " 구분자)
+        return "[" + ", ".join(self.req_json(rid) for rid in rids) + "]"
+
+    def tcs_json(self, tc_ids: List[str]) -> str:
+        return "[" + ", ".join(t for t in (self.tc_json(tc_id) for tc_id in tc_ids) if t is not None) + "]"
+
+
+# --- 프로세스 내 corpus 레지스트리 (state에는 corpus_id만, 객체는 여기서 공유) ---
+
+_registry: "OrderedDict[str, Corpus]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def register_corpus(corpus: Corpus) -> Corpus:
+    with _registry_lock:
+        _registry[corpus.corpus_id] = corpus
+        _registry.move_to_end(corpus.corpus_id)
+        while len(_registry) > _REGISTRY_SIZE:
+            _registry.popitem(last=False)
+    return corpus
+
+
+def get_corpus(state: Dict[str, Any]) -> Corpus:
+    """state의 corpus_id로 Corpus를 찾고, 없으면(다른 프로세스에서 checkpoint 재개 등) state 목록으로 다시 만든다."""
+    corpus_id = state.get("corpus_id")
+    with _registry_lock:
+        corpus = _registry.get(corpus_id) if corpus_id else None
+    if corpus is not None:
+        return corpus
+    return register_corpus(Corpus(
+        state["requirements"],
+        state["testcases"],
+        state["req_tc_mapping"],
+        state.get("input_fingerprints"),
+    ))
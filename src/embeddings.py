@@ -0,0 +1,224 @@
+import hashlib
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .cache import stable_hash
+from .sqlite_store import connect, select_in
+
+DEFAULT_EMBEDDING_PATH = "outputs/cache/embeddings.sqlite"
+INDEX_FILE = "tc_index.npz"
+EMBED_BATCH = 256
+BRUTE_FORCE_MAX = 4096  # 이 개수 이하면 IVF 없이 전체 비교 (정확하고 충분히 빠름)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbeddings(Embeddings):
+    """Ollama 없이 쓰는 오프라인 embedding stub (벤치마크/테스트용).
+
+    단어와 단어 안의 글자 bigram(한국어 조사 변화 대응)을 feature hashing으로 dim 차원 벡터로 만든다.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.model = f"hashing-{dim}"
+
+    def _embed(self, text: str) -> List[float]:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for word in _TOKEN.findall(text.lower()):
+            for feat in [word] + [word[i:i + 2] for i in range(len(word) - 1)]:
+                h = int.from_bytes(hashlib.blake2b(feat.encode("utf-8"), digest_size=8).digest(), "big")
+                vec[h % self.dim] += 1.0 if h >> 63 else -1.0
+        norm = np.linalg.norm(vec)
+        return (vec / norm if norm else vec).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def embedding_model_name(embeddings) -> str:
+    return getattr(embeddings, "model", None) or type(embeddings).__name__
+
+
+class EmbeddingStore:
+    """텍스트 hash → 벡터(float32 blob) SQLite 저장소. 텍스트가 안 바뀌면 다시 embedding하지 않는다."""
+
+    def __init__(self, path: str = DEFAULT_EMBEDDING_PATH, model: str = "default"):
+        self.path = path
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " vec BLOB NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (model, key))"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for k, blob in select_in(
+                self._conn, "SELECT key, vec FROM embeddings WHERE model = ? AND key IN ({marks})",
+                [self.model], keys,
+            ):
+                found[k] = np.frombuffer(blob, dtype=np.float32)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        now = time.time()
+        rows = [(self.model, k, np.asarray(v, dtype=np.float32).tobytes(), now) for k, v in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, vec, created_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def embed_texts(embeddings, store: EmbeddingStore, texts: List[str]) -> np.ndarray:
+    """texts 순서대로 L2 정규화된 (n, dim) 행렬. 저장소에 없는 텍스트만 EMBED_BATCH개씩 embedding."""
+    keys = [text_key(t) for t in texts]
+    vectors = store.get_many(keys)
+
+    missing = list({k: t for k, t in zip(keys, texts) if k not in vectors}.items())
+    for i in range(0, len(missing), EMBED_BATCH):
+        part = missing[i:i + EMBED_BATCH]
+        embedded = embeddings.embed_documents([t for _, t in part])
+        new = [(k, np.asarray(v, dtype=np.float32)) for (k, _), v in zip(part, embedded)]
+        store.put_many(new)
+        vectors.update(new)
+
+    if not keys:
+        return np.zeros((0, 0), dtype=np.float32)
+    matrix = np.vstack([vectors[k] for k in keys]).astype(np.float32, copy=False)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    """정규화 벡터용 IVF(inverted file) 근사 최근접 탐색 (numpy만 사용).
+
+    - k-means로 √n개 cluster를 만들고, 검색 시 가까운 n_probe개 cluster 안에서만 내적 비교
+    - 벡터가 BRUTE_FORCE_MAX개 이하면 cluster 없이 전체 비교
+    - centroids / 배정 결과는 signature와 함께 npz로 저장해서, 같은 벡터 집합이면 재사용
+    """
+
+    def __init__(self, vectors: np.ndarray, centroids: Optional[np.ndarray] = None,
+                 assign: Optional[np.ndarray] = None):
+        self.vectors = vectors
+        self.centroids = centroids
+        self.assign = assign
+        self._lists: List[np.ndarray] = []
+        if centroids is not None and assign is not None:
+            order = np.argsort(assign, kind="stable")
+            bounds = np.searchsorted(assign[order], np.arange(len(centroids) + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(centroids))]
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, n_lists: Optional[int] = None, iters: int = 8,
+              seed: int = 0) -> "VectorIndex":
+        n = len(vectors)
+        if n <= BRUTE_FORCE_MAX:
+            return cls(vectors)
+        n_lists = n_lists or int(np.sqrt(n))
+        rng = np.random.default_rng(seed)
+        # k-means는 표본으로만 학습 (cluster당 ~40개)
+        sample = vectors[rng.choice(n, size=min(n, n_lists * 40), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(iters):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            filled = norms[:, 0] > 0
+            centroids[filled] = sums[filled] / norms[filled]
+        return cls(vectors, centroids, cls._assign(vectors, centroids))
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        return np.concatenate([
+            np.argmax(vectors[i:i + chunk] @ centroids.T, axis=1)
+            for i in range(0, len(vectors), chunk)
+        ]).astype(np.int32)
+
+    def search(self, queries: np.ndarray, k: int, n_probe: int = 8) -> List[List[Tuple[int, float]]]:
+        """query마다 (벡터 row 번호, cosine score)를 score 내림차순으로 최대 k개."""
+        results: List[List[Tuple[int, float]]] = []
+        if not len(self.vectors) or k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        if self.centroids is None:
+            for i in range(0, len(queries), 1024):
+                scores = queries[i:i + 1024] @ self.vectors.T
+                results.extend(self._top(row, np.arange(len(self.vectors)), k) for row in scores)
+            return results
+
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :n_probe]
+        for q, lists in zip(queries, probes):
+            rows = np.concatenate([self._lists[c] for c in lists])
+            results.append(self._top(self.vectors[rows] @ q, rows, k))
+        return results
+
+    @staticmethod
+    def _top(scores: np.ndarray, rows: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        if len(scores) > k:
+            part = np.argpartition(-scores, k)[:k]
+        else:
+            part = np.arange(len(scores))
+        part = part[np.argsort(-scores[part], kind="stable")]
+        return [(int(rows[i]), float(scores[i])) for i in part]
+
+    def save(self, path: str, signature: str) -> None:
+        if self.centroids is None:
+            return
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, signature=np.array(signature), centroids=self.centroids, assign=self.assign)
+
+    @classmethod
+    def load_or_build(cls, path: str, signature: str, vectors: np.ndarray) -> "VectorIndex":
+        """저장된 index의 signature(벡터 집합 hash)가 같으면 centroids/배정을 재사용, 아니면 새로 만든다."""
+        if Path(path).exists() and len(vectors) > BRUTE_FORCE_MAX:
+            try:
+                with np.load(path) as data:
+                    if str(data["signature"]) == signature and len(data["assign"]) == len(vectors):
+                        return cls(vectors, data["centroids"], data["assign"])
+            except (OSError, ValueError, KeyError):
+                pass
+        index = cls.build(vectors)
+        index.save(path, signature)
+        return index
+
+
+def index_signature(model: str, texts_keys: List[str]) -> str:
+    return stable_hash(model, texts_keys)
@@ -0,0 +1,57 @@
+import csv
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable
+
+STATUS_TABLE = "status_table"
+DEFAULT_EXPORT_FORMATS = ("csv", "jsonl")  # parquet은 pyarrow(선택 의존성 [parquet]) 설치 후 명시적으로
+
+# 대시보드용 REQ status 표 컬럼 (리포트 1) 표와 같은 순서)
+COLUMNS = ("priority", "req_id", "title", "status", "confidence", "matched_tc_ids", "gaps", "notes", "model")
+_LIST_COLUMNS = ("matched_tc_ids", "gaps")
+
+
+def _write_csv(path: Path, records: Iterable[Dict[str, Any]]) -> None:
+    # Excel에서 한글이 깨지지 않게 BOM 포함, list 컬럼은 ';'로 join
+    with path.open("w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for r in records:
+            writer.writerow([";".join(r[c]) if c in _LIST_COLUMNS else r[c] for c in COLUMNS])
+
+
+def _write_jsonl(path: Path, records: Iterable[Dict[str, Any]]) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False))
+            f.write("\n")
+
+
+def _write_parquet(path: Path, records: Iterable[Dict[str, Any]]) -> None:
+    import pandas as pd
+
+    try:
+        pd.DataFrame(list(records), columns=list(COLUMNS)).to_parquet(path, index=False)
+    except ImportError as e:
+        # 요청한 format을 조용히 건너뛰지 않음
+        raise ImportError("parquet export에는 pyarrow가 필요함 (pip install '.[parquet]')") from e
+
+
+_WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+def write_status_table(out_dir: str, records: Callable[[], Iterable[Dict[str, Any]]],
+                       formats: Iterable[str]) -> Dict[str, str]:
+    """REQ status 표를 out_dir/status_table.<format>으로 저장하고 {format: path}를 돌려준다.
+
+    records는 행을 하나씩 만드는 iterator를 돌려주는 함수 (format마다 다시 순회, csv/jsonl은 행 단위로 씀).
+    parquet을 요청했는데 engine이 없으면 ImportError.
+    """
+    paths: Dict[str, str] = {}
+    for fmt in formats:
+        if fmt not in _WRITERS:
+            raise ValueError(f"지원하지 않는 export format: {fmt} ({', '.join(_WRITERS)})")
+        path = Path(out_dir) / f"{STATUS_TABLE}.{fmt}"
+        _WRITERS[fmt](path, records())
+        paths[fmt] = str(path)
+    return paths
@@ -1,44 +1,83 @@
-from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from .state import CoverageState
-from .nodes.load_data import load_data
-from .nodes.plan_node import plan_node
-from .nodes.evaluate_coverage import evaluate_coverage
-from .nodes.generate_report import generate_report
-from .nodes.human_review import human_review
-from .nodes.evaluate_coverage_llm import evaluate_coverage_llm
+if TYPE_CHECKING:
+    from langgraph.checkpoint.base import BaseCheckpointSaver
 
+# 그래프 구조(노드 / edge)는 데이터로 두고 build_graph와 visualize_graph가 같이 쓴다.
+# langgraph / langchain / 노드 모듈 import는 build_graph 안에서만 (import만 1초 이상 걸림)
+START, END = "__start__", "__end__"  # langgraph.graph.START / END와 같은 값
+
+NODES = ("plan_node", "load_data", "analyze_mapping", "generate_report", "human_review", "evaluate_coverage")
+CANDIDATES_NODE = "suggest_candidates"  # embeddings가 있을 때만
+
+# human_review의 action → 다음 노드
+REVIEW_ROUTES: Dict[str, str] = {
+    "approve": END,
+    "revise_plan": "plan_node",
+    "regenerate_report": "generate_report",
+}
+
+
+def graph_edges(with_candidates: bool) -> List[Tuple[str, str]]:
+    """고정 edge 목록 (human_review의 조건부 edge는 REVIEW_ROUTES)."""
+    edges = [(START, "plan_node"), ("plan_node", "load_data"), ("load_data", "analyze_mapping")]
+    # embeddings가 있으면 매핑 밖의 후보 TC를 찾아서 평가에 같이 넘김
+    if with_candidates:
+        edges += [("analyze_mapping", CANDIDATES_NODE), (CANDIDATES_NODE, "evaluate_coverage")]
+    else:
+        edges.append(("analyze_mapping", "evaluate_coverage"))
+    edges += [("evaluate_coverage", "generate_report"), ("generate_report", "human_review")]
+    return edges
+
+
+def _llm_node(func, afunc, llm):
+    from langchain_core.runnables import RunnableLambda
+
+    # invoke/stream이면 func, ainvoke/astream이면 afunc (LLM 호출을 스레드 없이 이벤트 루프에서)
+    if llm is None:
+        def missing(s):
+            raise RuntimeError("LLM 없이 만든 그래프는 실행할 수 없음 (구조 확인/시각화 전용)")
+
+        return RunnableLambda(missing, name=func.__name__)
+
+    async def acall(s):
+        return await afunc(s, llm)
+
+    return RunnableLambda(lambda s: func(s, llm), afunc=acall)
+
+
+def build_graph(llm=None, checkpointer: Optional["BaseCheckpointSaver"] = None, embeddings=None):
+    """coverage 그래프를 compile한다. llm 없이 만들면 구조만 (get_graph / draw_mermaid용)."""
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.graph import StateGraph
+
+    from .nodes.analyze_mapping import analyze_mapping
+    from .nodes.evaluate_coverage_llm import aevaluate_coverage_llm, evaluate_coverage_llm
+    from .nodes.generate_report import agenerate_report, generate_report
+    from .nodes.human_review import human_review
+    from .nodes.load_data import load_data
+    from .nodes.plan_node import aplan_node, plan_node
+    from .nodes.suggest_candidates import suggest_candidates
+    from .state import CoverageState
 
-def build_graph(llm):
     g = StateGraph(CoverageState)
 
-    g.add_node("plan_node", lambda s: plan_node(s, llm))
+    g.add_node("plan_node", _llm_node(plan_node, aplan_node, llm))
     g.add_node("load_data", load_data)
-    # g.add_node("evaluate_coverage", evaluate_coverage)
-    g.add_node("generate_report", lambda s: generate_report(s, llm))
+    g.add_node("analyze_mapping", analyze_mapping)
+    g.add_node("generate_report", _llm_node(generate_report, agenerate_report, llm))
     g.add_node("human_review", human_review)
-    g.add_node("evaluate_coverage", lambda s: evaluate_coverage_llm(s, llm))
-
+    g.add_node("evaluate_coverage", _llm_node(evaluate_coverage_llm, aevaluate_coverage_llm, llm))
+    if embeddings is not None:
+        g.add_node(CANDIDATES_NODE, lambda s: suggest_candidates(s, embeddings))
 
-    g.add_edge(START, "plan_node")
-    g.add_edge("plan_node", "load_data")
-    g.add_edge("load_data", "evaluate_coverage")
-    g.add_edge("evaluate_coverage", "generate_report")
-    g.add_edge("generate_report", "human_review")
-    
+    for src, dst in graph_edges(with_candidates=embeddings is not None):
+        g.add_edge(src, dst)
 
     def route(state: CoverageState):
         return state.get("action", "approve")
 
-    g.add_conditional_edges(
-        "human_review",
-        route,
-        {
-            "approve": END,
-            "revise_plan": "plan_node",
-            "regenerate_report": "generate_report",  # ✅ 추가
-        },
-    )
-
-    return g.compile(checkpointer=MemorySaver())
+    g.add_conditional_edges("human_review", route, REVIEW_ROUTES)
+
+    # checkpointer 미지정 시 기존처럼 메모리 저장 (디스크 저장은 src/checkpoint.py 참고)
+    return g.compile(checkpointer=checkpointer or MemorySaver())
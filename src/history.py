@@ -0,0 +1,173 @@
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .sqlite_store import connect
+
+HISTORY_FILE = "history.sqlite"
+DEFAULT_CONFIDENCE_DROP = 0.2  # 같은 status에서 confidence가 이만큼 떨어지면 "changed since last run"에 표시
+DEFAULT_TREND_RUNS = 10
+
+# verdicts에는 status를 이 순서의 정수로 저장 (값이 클수록 좋은 status)
+_STATUSES = ("not_covered", "partial", "unclear", "covered")
+_STATUS_RANK = {s: i for i, s in enumerate(_STATUSES)}
+
+Verdicts = Dict[str, Tuple[str, float]]  # req_id -> (status, confidence)
+
+
+def new_run_id() -> str:
+    # 시간순으로 정렬되는 run ID (같은 초에 여러 실행이 있어도 겹치지 않게 suffix)
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+class HistoryStore:
+    """실행(run)별 요약과 requirement별 판정을 쌓아두는 SQLite 저장소.
+
+    - runs: run 하나당 한 행 (project, 시각, strict coverage, status별 개수)
+    - verdicts: (run, req_id)마다 status / confidence만 (notes / gaps 등은 coverage_raw.json에)
+      run은 runs의 정수 id, status는 정수 코드라 run이 수백 개 쌓여도 작게 유지됨
+    같은 run_id로 다시 기록하면(regenerate_report) 덮어쓴다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " id INTEGER PRIMARY KEY,"
+            " run_id TEXT NOT NULL UNIQUE,"
+            " project TEXT NOT NULL,"
+            " started_at REAL NOT NULL,"
+            " model TEXT,"
+            " total INTEGER NOT NULL,"
+            " covered INTEGER NOT NULL,"
+            " partial INTEGER NOT NULL,"
+            " not_covered INTEGER NOT NULL,"
+            " unclear INTEGER NOT NULL,"
+            " strict_rate REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_project ON runs(project, started_at)")
+        # (run, req_id) clustered → 한 run 전체 읽기, (req_id, run) index → requirement별 추이
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " run INTEGER NOT NULL,"
+            " req_id TEXT NOT NULL,"
+            " status INTEGER NOT NULL,"
+            " confidence REAL NOT NULL,"
+            " PRIMARY KEY (run, req_id)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_verdicts_req ON verdicts(req_id, run)")
+        self._conn.commit()
+
+    def record_run(self, run_id: str, project: str, verdicts: Verdicts, model: Optional[str] = None) -> None:
+        counts = {s: 0 for s in _STATUS_RANK}
+        for status, _ in verdicts.values():
+            counts[status if status in counts else "unclear"] += 1
+        total = len(verdicts)
+        row = (run_id, project, time.time(), model, total, counts["covered"], counts["partial"],
+               counts["not_covered"], counts["unclear"], counts["covered"] / total if total else 0.0)
+        with self._lock, self._conn:
+            # 같은 run을 다시 기록하면 시작 시각은 유지하고 나머지만 갱신
+            self._conn.execute(
+                "INSERT INTO runs (run_id, project, started_at, model, total, covered, partial,"
+                " not_covered, unclear, strict_rate) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(run_id) DO UPDATE SET model = excluded.model, total = excluded.total,"
+                " covered = excluded.covered, partial = excluded.partial,"
+                " not_covered = excluded.not_covered, unclear = excluded.unclear,"
+                " strict_rate = excluded.strict_rate",
+                row,
+            )
+            run = self._conn.execute("SELECT id FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0]
+            self._conn.execute("DELETE FROM verdicts WHERE run = ?", (run,))
+            self._conn.executemany(
+                "INSERT INTO verdicts (run, req_id, status, confidence) VALUES (?, ?, ?, ?)",
+                ((run, rid, _STATUS_RANK.get(status, _STATUS_RANK["unclear"]), conf)
+                 for rid, (status, conf) in verdicts.items()),
+            )
+
+    def previous_run(self, project: str, run_id: str) -> Optional[Dict[str, Any]]:
+        """run_id보다 먼저 시작한 같은 project의 가장 최근 run (없으면 None)."""
+        with self._lock:
+            cur = self._conn.execute("SELECT started_at FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            before = cur[0] if cur else time.time()
+            c = self._conn.execute(
+                "SELECT * FROM runs WHERE project = ? AND run_id != ? AND started_at <= ?"
+                " ORDER BY started_at DESC LIMIT 1",
+                (project, run_id, before),
+            )
+            row = c.fetchone()
+            return dict(zip([d[0] for d in c.description], row)) if row else None
+
+    def verdicts(self, run_id: str) -> Verdicts:
+        with self._lock:
+            return {
+                rid: (_STATUSES[status], conf)
+                for rid, status, conf in self._conn.execute(
+                    "SELECT v.req_id, v.status, v.confidence FROM verdicts v"
+                    " JOIN runs r ON r.id = v.run WHERE r.run_id = ?",
+                    (run_id,),
+                )
+            }
+
+    def trend(self, project: str, limit: int = DEFAULT_TREND_RUNS) -> List[Dict[str, Any]]:
+        """최근 limit개 run 요약 (오래된 것부터)."""
+        with self._lock:
+            c = self._conn.execute(
+                "SELECT * FROM runs WHERE project = ? ORDER BY started_at DESC LIMIT ?", (project, limit)
+            )
+            cols = [d[0] for d in c.description]
+            return [dict(zip(cols, row)) for row in reversed(c.fetchall())]
+
+    def requirement_history(self, req_id: str, project: str, limit: int = 30) -> List[Dict[str, Any]]:
+        """requirement 하나의 run별 status / confidence 추이 (최근 limit개, 오래된 것부터)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.run_id, r.started_at, v.status, v.confidence FROM verdicts v"
+                " JOIN runs r ON r.id = v.run"
+                " WHERE v.req_id = ? AND r.project = ? ORDER BY r.started_at DESC LIMIT ?",
+                (req_id, project, limit),
+            ).fetchall()
+        return [
+            {"run_id": run_id, "started_at": started_at, "status": _STATUSES[status], "confidence": conf}
+            for run_id, started_at, status, conf in reversed(rows)
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def diff_verdicts(previous: Verdicts, current: Verdicts,
+                  confidence_drop: float = DEFAULT_CONFIDENCE_DROP) -> Dict[str, Any]:
+    """이전 run 대비 바뀐 requirement.
+
+    - newly_not_covered: 이전에는 not_covered가 아니었는데 이번에 not_covered
+    - regressed: status가 나빠짐 (covered → partial 등, newly_not_covered 포함)
+    - improved: status가 좋아짐
+    - confidence_drops: status는 같은데 confidence가 confidence_drop 이상 떨어짐 → (req_id, 이전, 이번)
+    - added / removed: 이번에 새로 생긴 / 없어진 requirement
+    """
+    diff: Dict[str, Any] = {
+        "newly_not_covered": [], "regressed": [], "improved": [],
+        "confidence_drops": [], "added": [], "removed": [],
+    }
+    for rid, (status, conf) in current.items():
+        if rid not in previous:
+            diff["added"].append(rid)
+            continue
+        prev_status, prev_conf = previous[rid]
+        rank, prev_rank = _STATUS_RANK.get(status, _STATUS_RANK["unclear"]), _STATUS_RANK.get(prev_status, _STATUS_RANK["unclear"])
+        if status == "not_covered" and prev_status != "not_covered":
+            diff["newly_not_covered"].append(rid)
+        if rank < prev_rank:
+            diff["regressed"].append((rid, prev_status, status))
+        elif rank > prev_rank:
+            diff["improved"].append(rid)
+        elif prev_conf - conf >= confidence_drop:
+            diff["confidence_drops"].append((rid, prev_conf, conf))
+    diff["removed"] = [rid for rid in previous if rid not in current]
+    diff["confidence_drops"].sort(key=lambda d: d[2] - d[1])
+    return diff
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .cache import stable_hash
+
+SNAPSHOT_FILE = "coverage_raw.json"
+
+
+def input_fingerprints(requirements: List[dict], testcases: List[dict],
+                       mapping: Dict[str, List[str]]) -> Dict[str, Any]:
+    """이번 실행 입력의 requirement / testcase별 hash와 매핑을 만든다 (coverage_raw.json에 함께 저장)."""
+    return {
+        "requirements": {r["req_id"]: stable_hash(r) for r in requirements},
+        "testcases": {tc["tc_id"]: stable_hash(tc) for tc in testcases},
+        "mapping": {r["req_id"]: list(mapping.get(r["req_id"], [])) for r in requirements},
+    }
+
+
+def evaluator_fingerprint(prompt: str, model: str) -> Dict[str, str]:
+    """판정을 만든 프롬프트 / 모델 (입력 fingerprint와 같이 저장해서, 바뀌면 이전 판정을 쓰지 않음)."""
+    return {"prompt": stable_hash(prompt), "model": model}
+
+
+def evaluator_changed(previous: Optional[Dict[str, Any]], current: Dict[str, str]) -> Optional[str]:
+    """이전 snapshot과 프롬프트 / 모델이 다르면 이유, 같으면 None (기록이 없는 예전 snapshot도 다른 것으로 봄)."""
+    previous = previous or {}
+    if previous.get("prompt") != current["prompt"]:
+        return "prompt_changed"
+    if previous.get("model") != current["model"]:
+        return "model_changed"
+    return None
+
+
+def load_previous_snapshot(output_dir: str) -> Optional[Dict[str, Any]]:
+    path = Path(output_dir) / SNAPSHOT_FILE
+    if not path.exists():
+        return None
+    try:
+        with path.open(encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    # 예전 포맷(입력 fingerprint 없음)은 비교할 수 없으므로 없는 것으로 취급
+    if not snapshot.get("inputs"):
+        return None
+    return snapshot
+
+
+def compute_dirty(current: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """다시 평가해야 하는 requirement → 이유.
+
+    requirement 자체가 그대로여도 매핑이 바뀌었거나 매핑된 TC 내용이 바뀌면 dirty로 본다.
+    """
+    cur_reqs = current["requirements"]
+    cur_tcs = current["testcases"]
+    cur_map = current["mapping"]
+
+    if previous is None:
+        return {rid: "no_previous_run" for rid in cur_reqs}
+
+    prev_inputs = previous.get("inputs", {})
+    prev_reqs = prev_inputs.get("requirements", {})
+    prev_tcs = prev_inputs.get("testcases", {})
+    prev_map = prev_inputs.get("mapping", {})
+    prev_verdicts = previous.get("per_requirement", {})
+
+    dirty: Dict[str, str] = {}
+    for rid, h in cur_reqs.items():
+        if rid not in prev_reqs:
+            dirty[rid] = "new_requirement"
+        elif prev_reqs[rid] != h:
+            dirty[rid] = "requirement_changed"
+        elif sorted(prev_map.get(rid, [])) != sorted(cur_map.get(rid, [])):
+            dirty[rid] = "mapping_changed"
+        else:
+            changed_tcs = [
+                tc_id for tc_id in cur_map.get(rid, [])
+                if cur_tcs.get(tc_id) != prev_tcs.get(tc_id)
+            ]
+            if changed_tcs:
+                dirty[rid] = "testcase_changed: " + ", ".join(changed_tcs)
+            elif rid not in prev_verdicts:
+                dirty[rid] = "no_previous_verdict"
+    return dirty
@@ -1,5 +1,142 @@
-from langchain_ollama import ChatOllama
+import itertools
+import os
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional
+from urllib.parse import urlsplit, urlunsplit
 
-def get_llm(model: str = "qwen3:8b", temperature: float = 0.0):
-    # OLLAMA_HOST 환경변수로 원격/로컬 조정 가능
-    return ChatOllama(model=model, temperature=temperature)
+import httpx
+from langchain_core.messages import BaseMessage
+from langchain_ollama import ChatOllama, OllamaEmbeddings
+from ollama import AsyncClient, Client
+from pydantic import PrivateAttr, model_validator
+
+DEFAULT_KEEP_ALIVE = 30 * 60  # 초. 느린 batch 사이에 모델이 내려가지 않게 (Ollama 기본 5분)
+# 기본 context(2048~4096)면 긴 batch 프롬프트 앞부분이 잘림. max_batch_tokens + 응답 길이보다 크게
+DEFAULT_NUM_CTX = 8192
+DEFAULT_TIMEOUT = 600.0  # 큰 batch 평가는 수 분 걸릴 수 있음
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_OLLAMA_PORT = 11434
+
+
+def _base_url(host: str) -> str:
+    # scheme 없는 주소는 ollama와 같이 http + 포트 11434 (10.0.0.5 → http://10.0.0.5:11434)
+    # ChatOllama는 scheme 없는 base_url을 버리고 localhost로 붙으므로 여기서 채운다
+    if "://" in host:
+        return host
+    split = urlsplit(f"http://{host}")
+    netloc = split.netloc if split.port else f"{split.netloc}:{DEFAULT_OLLAMA_PORT}"
+    return urlunsplit(("http", netloc, split.path.rstrip("/"), "", ""))
+
+
+def ollama_hosts(value: Optional[str] = None) -> List[str]:
+    """OLLAMA_HOSTS(쉼표 구분) 또는 OLLAMA_HOST → base_url 목록. 비어 있으면 [] (ollama 기본 localhost).
+
+    ollama 패키지가 import 시점에 OLLAMA_HOST를 단일 주소로 파싱하므로, 여러 서버는 OLLAMA_HOSTS에 적는다.
+    """
+    if value is None:
+        value = os.environ.get("OLLAMA_HOSTS") or os.environ.get("OLLAMA_HOST", "")
+    hosts = []
+    for host in value.split(","):
+        host = host.strip()
+        if host:
+            hosts.append(_base_url(host))
+    return hosts
+
+
+def _client_kwargs(max_connections: int, timeout: float) -> Dict[str, Any]:
+    # httpx connection pool을 batch 동안 유지 (호출마다 TCP 연결을 새로 맺지 않음)
+    return {
+        "timeout": httpx.Timeout(timeout, connect=10.0),
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=120.0,
+        ),
+    }
+
+
+class RoundRobinChatOllama(ChatOllama):
+    """여러 Ollama 서버에 호출을 번갈아 보내는 ChatOllama.
+
+    host마다 client(connection pool)를 하나씩 두고 호출 순서대로 돌아가며 쓴다.
+    ChatOllama를 그대로 상속하므로 constrain(format 바인딩) / model_copy(fallback 모델)도 그대로 동작한다.
+    """
+
+    hosts: List[str]
+
+    _clients: List[Client] = PrivateAttr(default_factory=list)
+    _async_clients: List[AsyncClient] = PrivateAttr(default_factory=list)
+    _next: Any = PrivateAttr(default=None)
+    _next_lock: Any = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _set_host_clients(self) -> "RoundRobinChatOllama":
+        kwargs = self.client_kwargs or {}
+        sync_kwargs = {**kwargs, **(self.sync_client_kwargs or {})}
+        async_kwargs = {**kwargs, **(self.async_client_kwargs or {})}
+        self._clients = [Client(host=h, **sync_kwargs) for h in self.hosts]
+        self._async_clients = [AsyncClient(host=h, **async_kwargs) for h in self.hosts]
+        self._next = itertools.count()
+        self._next_lock = threading.Lock()
+        return self
+
+    def _pick(self) -> int:
+        with self._next_lock:
+            return next(self._next) % len(self.hosts)
+
+    def _create_chat_stream(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> Iterator[Mapping[str, Any]]:
+        client = self._clients[self._pick()]
+        chat_params = self._chat_params(messages, stop, **kwargs)
+        if chat_params["stream"]:
+            yield from client.chat(**chat_params)
+        else:
+            yield client.chat(**chat_params)
+
+    async def _acreate_chat_stream(
+        self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        client = self._async_clients[self._pick()]
+        chat_params = self._chat_params(messages, stop, **kwargs)
+        if chat_params["stream"]:
+            async for part in await client.chat(**chat_params):
+                yield part
+        else:
+            yield await client.chat(**chat_params)
+
+
+def get_llm(
+    model: str = "qwen3:8b",
+    temperature: float = 0.0,
+    keep_alive: Optional[int] = DEFAULT_KEEP_ALIVE,
+    num_ctx: Optional[int] = DEFAULT_NUM_CTX,
+    hosts: Optional[List[str]] = None,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    timeout: float = DEFAULT_TIMEOUT,
+    **kwargs: Any,
+):
+    """Ollama chat model.
+
+    hosts를 안 주면 OLLAMA_HOSTS / OLLAMA_HOST 환경변수 (여러 개면 round-robin, 하나면 그 서버, 없으면 localhost).
+    프롬프트의 system 메시지는 변수 없이 고정이라, keep_alive로 모델이 올라가 있는 동안
+    서버가 같은 prefix의 KV cache를 재사용한다 (batch마다 system 프롬프트를 다시 계산하지 않음).
+    """
+    hosts = ollama_hosts() if hosts is None else hosts
+    params = {
+        "model": model,
+        "temperature": temperature,
+        "keep_alive": keep_alive,
+        "num_ctx": num_ctx,
+        "client_kwargs": _client_kwargs(max_connections, timeout),
+        **kwargs,
+    }
+    if len(hosts) > 1:
+        return RoundRobinChatOllama(hosts=hosts, base_url=hosts[0], **params)
+    return ChatOllama(base_url=hosts[0] if hosts else None, **params)
+
+
+def get_embeddings(model: str = "nomic-embed-text", keep_alive: Optional[int] = DEFAULT_KEEP_ALIVE):
+    # 후보 TC 제안용 로컬 embedding 모델 (오프라인 테스트는 src/embeddings.py의 HashingEmbeddings)
+    hosts = ollama_hosts()
+    return OllamaEmbeddings(model=model, keep_alive=keep_alive, base_url=hosts[0] if hosts else None)
@@ -0,0 +1,31 @@
+from typing import Any, Awaitable, Callable, Generator, NamedTuple
+
+
+class LLMStep(NamedTuple):
+    """노드 로직이 yield하는 LLM 호출 한 단계 (sync / async 실행 방법을 둘 다 가짐)."""
+
+    run: Callable[[], Any]
+    arun: Callable[[], Awaitable[Any]]
+
+
+# 노드 본문은 LLMStep을 yield하고 결과를 send로 받는 generator로 한 번만 작성하고,
+# sync 노드는 run_steps, async 노드는 arun_steps로 돌린다 (로직 중복 없이 invoke / ainvoke 둘 다 지원)
+Steps = Generator[LLMStep, Any, Any]
+
+
+def run_steps(steps: Steps) -> Any:
+    try:
+        step = next(steps)
+        while True:
+            step = steps.send(step.run())
+    except StopIteration as done:
+        return done.value
+
+
+async def arun_steps(steps: Steps) -> Any:
+    try:
+        step = next(steps)
+        while True:
+            step = steps.send(await step.arun())
+    except StopIteration as done:
+        return done.value
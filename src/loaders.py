@@ -0,0 +1,249 @@
+import csv
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_REQUIREMENTS_PATH = "data/requirements.json"
+DEFAULT_TESTCASES_PATH = "data/testcases.json"
+DEFAULT_MAPPING_PATH = "data/req_tc_mapping.json"
+
+_READ_CHUNK = 1 << 16
+_STEP_PREFIX = re.compile(r"^\s*(\d+[).]|[-*•])\s*")
+_ID_SPLIT = re.compile(r"[,;|\n]")
+
+
+# ---------------------------------------------------------------------------
+# raw record streaming (CSV / JSON array / JSONL)
+# ---------------------------------------------------------------------------
+
+def iter_csv(path: str) -> Iterator[dict]:
+    # utf-8-sig: qTest export의 BOM 제거, newline="": 따옴표 안의 줄바꿈(steps) 유지
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            yield {(k or "").strip(): v for k, v in row.items()}
+
+
+def iter_jsonl(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_json_array(path: str, chunk_size: int = _READ_CHUNK) -> Iterator[dict]:
+    """최상위가 배열인 JSON 파일을 원소 단위로 읽는다 (파일 전체를 문자열로 올리지 않음)."""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8-sig") as f:
+        buf, pos, eof, started = "", 0, False, False
+        while True:
+            # 공백/구분자 건너뛰기
+            while pos < len(buf) and (buf[pos].isspace() or (started and buf[pos] == ",")):
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    raise ValueError(f"{path}: unexpected end of JSON array")
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = more, 0
+                continue
+
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # 원소가 chunk 경계에 걸림 → 더 읽어서 다시 시도
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            yield item
+            pos = end
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return iter_csv(path)
+    if suffix in (".jsonl", ".ndjson"):
+        return iter_jsonl(path)
+    return iter_json_array(path)
+
+
+# ---------------------------------------------------------------------------
+# normalize (qTest export 컬럼 → requirement / testcase dict)
+# ---------------------------------------------------------------------------
+
+def _first(row: dict, *keys: str) -> Any:
+    for k in keys:
+        v = row.get(k)
+        if v not in (None, ""):
+            return v
+    return None
+
+
+def split_ids(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in _ID_SPLIT.split(str(value)) if v.strip()]
+
+
+def _split_steps(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    # "1) 로그인 페이지 진입\n2) ..." → ["로그인 페이지 진입", ...]
+    return [_STEP_PREFIX.sub("", line).strip() for line in str(value).splitlines() if line.strip()]
+
+
+def normalize_requirement(row: dict) -> dict:
+    req = {
+        "req_id": str(_first(row, "req_id", "id")).strip(),
+        "title": _first(row, "title", "name") or "",
+        "description": _first(row, "description") or "",
+    }
+    # 선택 컬럼은 값이 있을 때만 (JSON 입력과 같은 dict가 되도록 → 캐시/fingerprint 안정)
+    for key in ("component", "priority"):
+        if row.get(key) not in (None, ""):
+            req[key] = row[key]
+    return req
+
+
+def normalize_testcase(row: dict) -> dict:
+    tc = {
+        "tc_id": str(_first(row, "tc_id", "id")).strip(),
+        "title": _first(row, "title", "name") or "",
+        "steps": _split_steps(_first(row, "steps")),
+        "expected": _first(row, "expected", "expected_result") or "",
+    }
+    if row.get("tags") not in (None, ""):
+        tc["tags"] = split_ids(row["tags"])
+    if row.get("module") not in (None, ""):
+        tc["module"] = row["module"]
+    return tc
+
+
+def load_mapping(path: str) -> Dict[str, List[str]]:
+    """req→tc 매핑 파일. JSON object, 또는 req_id/tc_id(s) 행으로 된 CSV/JSONL."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".json":
+        with open(path, encoding="utf-8-sig") as f:
+            return {rid: split_ids(tcs) for rid, tcs in json.load(f).items()}
+
+    mapping: Dict[str, List[str]] = {}
+    for row in iter_records(path):
+        rid = str(row["req_id"]).strip()
+        tc_ids = mapping.setdefault(rid, [])
+        for tc_id in split_ids(_first(row, "tc_ids", "tc_id")):
+            if tc_id not in tc_ids:
+                tc_ids.append(tc_id)
+    return mapping
+
+
+def load_corpus(
+    requirements_path: str = DEFAULT_REQUIREMENTS_PATH,
+    testcases_path: str = DEFAULT_TESTCASES_PATH,
+    mapping_path: Optional[str] = DEFAULT_MAPPING_PATH,
+    mapping_column: Optional[str] = None,
+) -> Tuple[List[dict], List[dict], Dict[str, List[str]]]:
+    """requirements / testcases / mapping을 읽어서 정규화한다.
+
+    mapping_column이 있으면 export 컬럼에서 매핑을 만든다.
+    - requirement 행에 있으면: 그 requirement에 연결된 TC ID 목록
+    - testcase 행에 있으면: 그 TC가 연결된 requirement ID 목록 (역방향으로 합침)
+    """
+    mapping: Dict[str, List[str]] = {}
+
+    requirements: List[dict] = []
+    for row in iter_records(requirements_path):
+        req = normalize_requirement(row)
+        requirements.append(req)
+        if mapping_column and mapping_column in row:
+            mapping[req["req_id"]] = split_ids(row[mapping_column])
+
+    testcases: List[dict] = []
+    for row in iter_records(testcases_path):
+        tc = normalize_testcase(row)
+        testcases.append(tc)
+        if mapping_column and mapping_column in row:
+            for rid in split_ids(row[mapping_column]):
+                tc_ids = mapping.setdefault(rid, [])
+                if tc["tc_id"] not in tc_ids:
+                    tc_ids.append(tc["tc_id"])
+
+    if not mapping_column and mapping_path:
+        mapping = load_mapping(mapping_path)
+
+    return requirements, testcases, mapping
+
+
+# ---------------------------------------------------------------------------
+# validation (LLM / 그래프 없이 입력 데이터만 점검, cli validate)
+# ---------------------------------------------------------------------------
+
+_MAX_ISSUE_IDS = 20
+
+
+def _duplicates(ids: List[str]) -> List[str]:
+    seen, dup = set(), []
+    for i in ids:
+        if i in seen and i not in dup:
+            dup.append(i)
+        seen.add(i)
+    return dup
+
+
+def validate_corpus(
+    requirements: List[dict], testcases: List[dict], mapping: Dict[str, List[str]]
+) -> Dict[str, Any]:
+    """load_corpus 결과의 정합성 점검.
+
+    errors(평가 결과가 틀어지는 문제: ID 누락/중복)와 warnings(매핑 누락 등)를
+    {"message": ..., "count": n, "ids": 앞 20개}로 돌려준다.
+    """
+    req_ids = [r["req_id"] for r in requirements]
+    tc_ids = [tc["tc_id"] for tc in testcases]
+    req_set, tc_set = set(req_ids), set(tc_ids)
+    mapped_tcs = {t for tcs in mapping.values() for t in tcs}
+
+    def issue(message: str, ids: List[str]) -> Dict[str, Any]:
+        return {"message": message, "count": len(ids), "ids": ids[:_MAX_ISSUE_IDS]}
+
+    checks = {
+        "errors": [
+            ("requirement ID 없음", [str(i) for i, rid in enumerate(req_ids) if rid in ("", "None")]),
+            ("testcase ID 없음", [str(i) for i, tid in enumerate(tc_ids) if tid in ("", "None")]),
+            ("중복 requirement ID", _duplicates(req_ids)),
+            ("중복 testcase ID", _duplicates(tc_ids)),
+        ],
+        "warnings": [
+            ("매핑에만 있는 requirement ID", [rid for rid in mapping if rid not in req_set]),
+            ("매핑에만 있는 testcase ID (dangling)", sorted(mapped_tcs - tc_set)),
+            ("매핑된 TC가 없는 requirement", [rid for rid in req_ids if not mapping.get(rid)]),
+            ("어떤 requirement에도 매핑되지 않은 testcase", [tid for tid in tc_ids if tid not in mapped_tcs]),
+            ("title이 빈 requirement", [r["req_id"] for r in requirements if not str(r["title"]).strip()]),
+            ("steps가 빈 testcase", [tc["tc_id"] for tc in testcases if not tc["steps"]]),
+        ],
+    }
+    return {
+        "stats": {
+            "requirements": len(requirements),
+            "testcases": len(testcases),
+            "mapping_edges": sum(len(tcs) for tcs in mapping.values()),
+        },
+        **{level: [issue(msg, ids) for msg, ids in found if ids] for level, found in checks.items()},
+    }
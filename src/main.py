@@ -1,20 +1,127 @@
+import asyncio
+import sys
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
 from langchain_core.runnables import RunnableConfig
-from .llm import get_llm
+from langgraph.types import Command
+from .checkpoint import apply_resume_overrides, checkpoint_path, get_checkpointer, select_run_thread
+from .llm import get_embeddings, get_llm
 from .graph import build_graph
+from .nodes.human_review import prompt_review
+from .tracing import DEFAULT_TRACE_FILE, Tracer
+
+OBJECTIVE = "qTest의 Requirements와 TestCase를 매핑하고, 전체 커버리지를 점검한 리포트를 만들어줘"
+THREAD_ID = "qtest-coverage-001"
+DEFAULT_INPUTS: Dict[str, Any] = {
+    "objective": OBJECTIVE,
+    "batch_size": 30,
+    "max_batch_tokens": 6000,
+    "max_concurrency": 4,
+    "incremental": True,
+}
+
+
+def _resume(app, config: RunnableConfig, snapshot, inputs: Dict[str, Any]) -> None:
+    # 재개해도 이번 실행의 옵션(auto_approve_threshold 등)을 쓴다. 데이터 입력이 다르면 실행하지 않음
+    try:
+        apply_resume_overrides(app, config, snapshot, inputs)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    print(f"Resuming interrupted run: {config['configurable']['thread_id']}")
+
+
+def _build_app(model: str, use_embeddings: bool, output_dir: str = "outputs"):
+    # 디스크 checkpointer(<output_dir>/checkpoints.sqlite): 중간에 죽어도 다시 실행하면 마지막 run thread에서 이어서 진행
+    return build_graph(
+        get_llm(model=model, temperature=0.0),
+        checkpointer=get_checkpointer(checkpoint_path(output_dir)),
+        # 매핑 밖의 후보 TC 제안 (ollama pull nomic-embed-text)
+        embeddings=get_embeddings() if use_embeddings else None,
+    )
+
+
+async def astream_coverage(app, inputs: Optional[Dict[str, Any]], config: RunnableConfig) -> AsyncIterator[Tuple[str, Any]]:
+    """coverage job 하나를 async로 실행하면서 (stream_mode, chunk)를 내보낸다.
+
+    - "updates": 노드가 끝날 때마다 바뀐 key
+    - "custom": evaluate_coverage의 batch 단위 진행 상황
+    thread_id만 job마다 다르게 주면 한 프로세스에서 여러 job을 asyncio.gather로 동시에 돌릴 수 있다.
+    inputs가 None이면 checkpoint에서 재개.
+    """
+    async for mode, chunk in app.astream(inputs, config=config, stream_mode=["updates", "custom"]):
+        yield mode, chunk
+
 
-def main():
-    llm = get_llm(model="qwen3:8b", temperature=0.0)
-    app = build_graph(llm)
+async def amain(model: str = "qwen3:8b", thread_id: str = THREAD_ID,
+                overrides: Optional[Dict[str, Any]] = None, use_embeddings: bool = True):
+    inputs = {**DEFAULT_INPUTS, **(overrides or {})}
+    output_dir = inputs.get("output_dir", "outputs")
+    app = _build_app(model, use_embeddings, output_dir)
 
-    objective = "qTest의 Requirements와 TestCase를 매핑하고, 전체 커버리지를 점검한 리포트를 만들어줘"
+    # 노드 / LLM 호출별 타이밍·토큰 trace (main()과 같은 JSONL)
+    tracer = Tracer(f"{output_dir}/{DEFAULT_TRACE_FILE}")
 
+    run_thread, pending_run = select_run_thread(app, thread_id)
     config = RunnableConfig(
         recursion_limit=10,
-        configurable={"thread_id": "qtest-coverage-001"},
+        configurable={"thread_id": run_thread},
+        callbacks=[tracer],
     )
+    if pending_run is not None:
+        _resume(app, config, pending_run, inputs)
 
-    out = app.invoke({"objective": objective, "batch_size": 10}, config=config)
+    # human_review가 interrupt로 멈추면 콘솔에서 입력받아 Command(resume=...)로 이어감
+    run_input: Any = None if pending_run is not None else inputs
+    while True:
+        pending = None
+        async for mode, chunk in astream_coverage(app, run_input, config):
+            if mode == "custom":
+                print(f"[progress] batch {chunk['batches_done']}/{chunk['batches_total']} "
+                      f"(requirements {chunk['requirements_done']}/{chunk['requirements_total']})")
+            elif "__interrupt__" in chunk:
+                pending = chunk["__interrupt__"][0].value
+            else:
+                print(f"[node] {', '.join(chunk)}")
+        if pending is None:
+            break
+        run_input = Command(resume=prompt_review(pending))
 
+    report_path = (await app.aget_state(config)).values.get("report_path", f"{output_dir}/report.md")
+    tracer.append_summary(report_path)
+    tracer.close()
+
+    print(f"Report saved to {report_path}")
+    print(f"Trace saved to {output_dir}/{DEFAULT_TRACE_FILE}")
+
+
+def main(model: str = "qwen3:8b", thread_id: str = THREAD_ID,
+         overrides: Optional[Dict[str, Any]] = None, use_embeddings: bool = True):
+    inputs = {**DEFAULT_INPUTS, **(overrides or {})}
+    output_dir = inputs.get("output_dir", "outputs")
+    app = _build_app(model, use_embeddings, output_dir)
+
+    # 노드 / LLM 호출별 타이밍·토큰 trace (LangSmith 없이 로컬 JSONL)
+    tracer = Tracer(f"{output_dir}/{DEFAULT_TRACE_FILE}")
+
+    # thread_id는 run마다 새로 (base:run_id) — 이전 run의 채널 값이 새 run 입력에 섞이지 않게
+    run_thread, pending_run = select_run_thread(app, thread_id)
+    config = RunnableConfig(
+        recursion_limit=10,
+        configurable={"thread_id": run_thread},
+        callbacks=[tracer],
+    )
+
+    # 이전 실행이 중간에 끊겼으면(다음 노드가 남아 있으면) 그 지점부터 재개
+    if pending_run is not None:
+        _resume(app, config, pending_run, inputs)
+        out = app.invoke(None, config=config)
+    else:
+        out = app.invoke(inputs, config=config)
+
+    # human_review가 interrupt로 멈춰 있으면 콘솔에서 검토 후 재개
+    # (다른 프로세스에서 같은 thread_id로 Command(resume=...)를 보내도 됨)
+    while out.get("__interrupt__"):
+        out = app.invoke(Command(resume=prompt_review(out["__interrupt__"][0].value)), config=config)
 
     print("=== DONE ===")
     print("Covered:", out.get("covered_requirements", []))
@@ -22,7 +129,18 @@ def main():
     print("Not Covered:", out.get("uncovered_requirements", []))
     print("Unclear:", out.get("unclear_requirements", []))
 
-    print("Report saved to outputs/report.md")
+    report_path = out.get("report_path", f"{output_dir}/report.md")
+    tracer.append_summary(report_path)
+    tracer.close()
+
+    print(f"Report saved to {report_path}")
+    for fmt, path in out.get("export_paths", {}).items():
+        print(f"Status table ({fmt}) saved to {path}")
+    print(f"Trace saved to {output_dir}/{DEFAULT_TRACE_FILE}")
 
 if __name__ == "__main__":
-    main()
+    # python -m src.main --async : astream으로 실행하며 batch 진행 상황 출력
+    if "--async" in sys.argv:
+        asyncio.run(amain())
+    else:
+        main()
@@ -1,8 +1,10 @@
+from ..corpus import get_corpus
 from ..state import CoverageState
 
 def analyze_coverage(state: CoverageState) -> CoverageState:
-    mapping = state["req_tc_mapping"]
-    req_ids = [r["req_id"] for r in state["requirements"]]
+    corpus = get_corpus(state)
+    mapping = corpus.mapping
+    req_ids = corpus.req_ids
 
     covered = []
     uncovered = []
@@ -24,7 +26,6 @@ def analyze_coverage(state: CoverageState) -> CoverageState:
     coverage_rate = len(covered) / len(req_ids) if req_ids else 0
 
     return {
-        **state,
         "covered_requirements": covered,
         "uncovered_requirements": uncovered,
         "weak_requirements": weak,
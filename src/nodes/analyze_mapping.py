@@ -0,0 +1,105 @@
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import numpy as np
+
+from ..corpus import Corpus, get_corpus
+from ..state import CoverageState
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_HUB_TC_THRESHOLD = 50
+WEAK_MAX_TCS = 1          # TC 1개면 약함(weak)
+OVER_TESTED_MIN_TCS = 5   # 5개 이상이면 과다(over-tested)
+
+
+def _edges(corpus: Corpus) -> "pd.DataFrame":
+    """req→tc 매핑을 (req_id, tc_id, known) edge 테이블로 펼친다 (Python 루프 없이 한 번에)."""
+    import pandas as pd
+
+    rids = list(corpus.mapping.keys())
+    lengths = np.fromiter((len(corpus.mapping[rid]) for rid in rids), dtype=np.int64, count=len(rids))
+    edges = pd.DataFrame({
+        "req_id": np.repeat(np.array(rids, dtype=object), lengths),
+        "tc_id": np.fromiter(chain.from_iterable(corpus.mapping.values()), dtype=object, count=int(lengths.sum())),
+    })
+    edges["known"] = edges["tc_id"].isin(corpus.tc_by_id.keys())
+    return edges
+
+
+def mapping_analytics(corpus: Corpus, hub_threshold: int = DEFAULT_HUB_TC_THRESHOLD) -> Dict[str, Any]:
+    """매핑만으로(LLM 없이) 계산하는 corpus 전체 지표.
+
+    - weak / over_tested / coverage_rate: 기존 analyze_coverage와 같은 기준 (매핑된 TC 개수)
+    - hub_tcs: hub_threshold개 이상의 requirement에 매핑된 TC
+    - orphan_tcs: 어떤 requirement에도 매핑되지 않은 TC
+    - dangling_tc_ids: 매핑에는 있지만 testcases에 없는 TC ID
+    - sole_coverage: TC → 그 TC가 유일한(존재하는) 매핑 TC인 requirement 목록
+      (= 그 TC를 삭제하면 커버리지를 잃는 requirement)
+    """
+    # pandas는 import가 느려서(~0.4s) 실제 계산할 때만 (cli validate / visualize 시작 시간)
+    import pandas as pd
+
+    edges = _edges(corpus)
+    req_index = pd.Index(corpus.req_ids)
+
+    n_tcs = edges.groupby("req_id", sort=False).size().reindex(req_index, fill_value=0)
+    known = edges[edges["known"]]
+    n_known = known.groupby("req_id", sort=False).size()
+
+    tc_fanout = known.groupby("tc_id", sort=False)["req_id"].nunique()
+    hubs = tc_fanout[tc_fanout >= hub_threshold].sort_values(ascending=False)
+
+    tc_index = pd.Index(corpus.tc_ids)
+    orphans = tc_index[~tc_index.isin(tc_fanout.index)]
+    dangling = edges.loc[~edges["known"], "tc_id"].unique()
+
+    # groupby().agg(list)는 그룹마다 Python 호출이라 느림 → 단독 edge(최대 requirement 수)만 한 번 훑는다
+    sole_edges = known[known["req_id"].map(n_known).eq(1)]
+    sole_by_tc: Dict[str, List[str]] = {}
+    for tc_id, rid in zip(sole_edges["tc_id"].tolist(), sole_edges["req_id"].tolist()):
+        sole_by_tc.setdefault(tc_id, []).append(rid)
+    sole = dict(sorted(sole_by_tc.items(), key=lambda kv: -len(kv[1])))
+
+    covered = int((n_tcs > 0).sum())
+    return {
+        "corpus_id": corpus.corpus_id,
+        "hub_threshold": hub_threshold,
+        "weak_requirements": n_tcs.index[n_tcs == WEAK_MAX_TCS].tolist(),
+        "over_tested_requirements": n_tcs.index[n_tcs >= OVER_TESTED_MIN_TCS].tolist(),
+        "coverage_rate": covered / len(req_index) if len(req_index) else 0.0,
+        "mapped_requirements": covered,
+        "mapped_tcs": int(len(tc_fanout)),
+        "hub_tcs": {tc_id: int(n) for tc_id, n in hubs.items()},
+        "orphan_tcs": orphans.tolist(),
+        "dangling_tc_ids": dangling.tolist(),
+        "sole_coverage": sole,
+    }
+
+
+def analyze_mapping(state: CoverageState) -> CoverageState:
+    corpus = get_corpus(state)
+    hub_threshold = state.get("hub_tc_threshold") or DEFAULT_HUB_TC_THRESHOLD
+
+    # revise_plan 루프 등으로 다시 들어와도 corpus가 같으면 재계산하지 않음
+    prev = state.get("mapping_analytics") or {}
+    if prev.get("corpus_id") == corpus.corpus_id and prev.get("hub_threshold") == hub_threshold:
+        return {}
+
+    analytics = mapping_analytics(corpus, hub_threshold)
+    return {
+        "mapping_analytics": analytics,
+        "weak_requirements": analytics["weak_requirements"],
+        "over_tested_requirements": analytics["over_tested_requirements"],
+        "coverage_rate": analytics["coverage_rate"],
+    }
+
+
+def impacted_requirements(corpus: Corpus, tc_id: str) -> Dict[str, List[str]]:
+    """TC 하나를 삭제했을 때의 영향: 매핑된 requirement 전체와 그중 커버리지를 잃는 requirement."""
+    mapped = corpus.reqs_by_tc.get(tc_id, [])
+    return {
+        "mapped": list(mapped),
+        "loses_coverage": [rid for rid in mapped if corpus.known_tc_ids(rid) == [tc_id]],
+    }
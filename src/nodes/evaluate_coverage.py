@@ -1,8 +1,12 @@
+from typing import Dict, List, Optional, Tuple
+
+from ..corpus import get_corpus
 from ..state import CoverageState
 
 def evaluate_coverage(state: CoverageState) -> CoverageState:
-    mapping = state["req_tc_mapping"]
-    req_ids = [r["req_id"] for r in state["requirements"]]
+    corpus = get_corpus(state)
+    mapping = corpus.mapping
+    req_ids = corpus.req_ids
 
     covered, uncovered = [], []
     weak, over_tested = [], []
@@ -26,10 +30,50 @@ def evaluate_coverage(state: CoverageState) -> CoverageState:
     rate = 0.0 if not req_ids else (len(covered) / len(req_ids))
 
     return {
-        **state,
         "covered_requirements": covered,
         "uncovered_requirements": uncovered,
         "weak_requirements": weak,
         "over_tested_requirements": over_tested,
         "coverage_rate": rate,
     }
+
+
+def preclassify(
+    requirements: List[dict],
+    mapping: Dict[str, List[str]],
+    tc_by_id: Dict[str, dict],
+    candidates: Optional[Dict[str, List[str]]] = None,
+) -> Tuple[Dict[str, dict], List[dict]]:
+    """LLM 없이 확정 가능한 requirement를 먼저 판정한다.
+
+    - 매핑된 TC가 없음 → not_covered (confidence 1.0)
+    - 매핑된 TC ID가 전부 testcases에 없음 → not_covered (confidence 1.0)
+    나머지(판단이 필요한 것)와 embedding 후보 TC가 있는 requirement는 ambiguous로 돌려서 LLM 평가로 넘긴다.
+    """
+    settled: Dict[str, dict] = {}
+    ambiguous: List[dict] = []
+
+    for r in requirements:
+        rid = r["req_id"]
+        matched = mapping.get(rid, [])
+        known = [tc_id for tc_id in matched if tc_id in tc_by_id]
+
+        if known or (candidates and candidates.get(rid)):
+            ambiguous.append(r)
+            continue
+
+        if not matched:
+            notes = "매핑된 TestCase 없음 (rule)"
+        else:
+            notes = f"매핑된 TC가 testcases에 존재하지 않음: {', '.join(matched)} (rule)"
+
+        settled[rid] = {
+            "status": "not_covered",
+            "matched_tc_ids": [],
+            "gaps": [f"'{r.get('title', rid)}'을(를) 검증하는 TestCase 없음 (정상/예외/경계 케이스 모두 필요)"],
+            "notes": notes,
+            "confidence": 1.0,
+            "source": "rule",
+        }
+
+    return settled, ambiguous
@@ -1,8 +1,22 @@
 import json
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
+from ..batching import DEFAULT_MAX_BATCH_TOKENS, estimate_tokens, plan_batches
+from ..cache import LLMCache, model_name, open_cache, prompt_text, stable_hash
+from ..corpus import Corpus, get_corpus
+from ..incremental import evaluator_changed, evaluator_fingerprint
+from ..llm_steps import LLMStep, Steps, arun_steps, run_steps
+from ..schemas import EvalResponse, RequirementVerdict, constrain, parse_items, verdicts_by_id
 from ..state import CoverageState
+from ..tracing import emit_event, emit_progress, submit_metadata
+from .evaluate_coverage import preclassify
 
+DEFAULT_MIN_CONFIDENCE = 0.6  # 이보다 낮은 판정은 작은 batch로 한 번 더 물어봄
+DEFAULT_REQUERY_BATCH_SIZE = 5  # fallback 모델로 다시 평가할 때 batch 크기
+
+# system 메시지에는 변수를 넣지 않는다: 모든 batch가 같은 prefix로 시작해야 Ollama가 KV cache를 재사용함
+# (batch별 데이터는 전부 human 메시지로)
 EVAL_PROMPT = ChatPromptTemplate.from_messages([
     ("system",
      "너는 QA 커버리지 리뷰어다.\n"
@@ -14,77 +28,407 @@ EVAL_PROMPT = ChatPromptTemplate.from_messages([
      "- partial: 핵심(happy-path)은 있으나 중요한 예외/부정/경계 검증이 부족함\n"
      "- not_covered: 매핑된 TC가 없거나, TC 내용이 요구사항 검증과 무관함\n"
      "- unclear: TC/요구사항 서술이 너무 모호하여 판단 불가\n\n"
-     "반드시 아래 JSON 형식으로만 출력해라(추가 텍스트 금지).\n"
+     "반드시 아래 JSON 형식으로만 출력해라(추가 텍스트 금지). 입력의 모든 requirement를 한 번씩 포함하라.\n"
      "{{\n"
-     '  "per_requirement": {{\n'
-     '    "REQ-001": {{\n'
+     '  "per_requirement": [\n'
+     "    {{\n"
+     '      "req_id": "REQ-001",\n'
      '      "status": "covered|partial|not_covered|unclear",\n'
      '      "matched_tc_ids": ["TC-101"],\n'
      '      "gaps": ["빠진 검증 포인트(예: 실패 케이스, 경계조건 등)"],\n'
-     '      "notes": "판단 근거(짧게)",\n'
+     '      "notes": "판단 근거(한 문장)",\n'
      '      "confidence": 0.0\n'
      "    }}\n"
-     "  }},\n"
-     '  "summary": {{\n'
-     '    "covered": [],\n'
-     '    "partial": [],\n'
-     '    "not_covered": [],\n'
-     '    "unclear": [],\n'
-     '    "coverage_rate_strict": 0.0\n'
-     "  }}\n"
+     "  ]\n"
      "}}\n\n"
-     "- coverage_rate_strict는 covered만 커버로 계산\n"
      "- confidence는 0~1\n"
+     "- candidate_tcs는 매핑되지 않았지만 텍스트 유사도로 찾은 후보 TC다.\n"
+     "  후보 TC가 요구사항을 실제로 검증하면 matched_tc_ids에 포함하고 notes에 '후보 TC'라고 적어라. 무관하면 무시하라.\n"
      ),
     ("human",
      "requirements:\n{requirements}\n\n"
      "testcases:\n{testcases}\n\n"
-     "req_tc_mapping:\n{mapping}\n")
+     "req_tc_mapping:\n{mapping}\n\n"
+     "candidate_tcs:\n{candidates}\n")
 ])
 
 
-def _index_testcases(testcases: List[dict]) -> Dict[str, dict]:
-    return {tc["tc_id"]: tc for tc in testcases}
+def _build_batch_input(req_batch: List[dict], corpus: Corpus,
+                       candidates: Dict[str, List[str]]) -> Dict[str, str]:
+    # batch에 포함된 requirement들에 매핑된 testcase(+ 후보 TC)만 추려서 LLM에 제공 (토큰 절약)
+    used_tc_ids = set()
+    mapping_batch = {}
+    candidates_batch = {}
+    for r in req_batch:
+        rid = r["req_id"]
+        tc_ids = corpus.mapped_tc_ids(rid)
+        mapping_batch[rid] = tc_ids
+        used_tc_ids.update(tc_ids)
+        if rid in candidates:
+            candidates_batch[rid] = candidates[rid]
+            used_tc_ids.update(candidates[rid])
 
-def _chunk(lst: List[Any], size: int):
-    for i in range(0, len(lst), size):
-        yield lst[i:i+size]
+    # 레코드 JSON은 corpus에 캐시된 것을 이어 붙임 (batch마다 같은 TC를 다시 직렬화하지 않음)
+    return {
+        "requirements": corpus.reqs_json([r["req_id"] for r in req_batch]),
+        "testcases": corpus.tcs_json(sorted(used_tc_ids)),
+        "mapping": json.dumps(mapping_batch, ensure_ascii=False),
+        "candidates": json.dumps(candidates_batch, ensure_ascii=False),
+    }
 
-def evaluate_coverage_llm(state: CoverageState, llm) -> CoverageState:
-    reqs_all = state["requirements"]
-    tcs = state["testcases"]
-    mapping = state["req_tc_mapping"]
+def _verdict_cache_key(rid: str, corpus: Corpus, candidate_ids: List[str], prompt: str, model: str) -> str:
+    # requirement + 매핑된 TC 내용 + 후보 TC 내용 + 프롬프트 + 모델이 모두 같을 때만 같은 key
+    # (레코드 내용은 corpus에 미리 계산된 레코드 hash로 대신함)
+    tc_ids = corpus.mapped_tc_ids(rid)
+    mapped_tcs = [corpus.tc_hash(tc_id) for tc_id in sorted(tc_ids)]
+    parts = [corpus.req_hash(rid), tc_ids, mapped_tcs]
+    if candidate_ids:
+        parts.append({tc_id: corpus.tc_hash(tc_id) for tc_id in candidate_ids})
+    return stable_hash(*parts, prompt, model)
+
+def _parse_eval(resp: Any) -> Optional[Dict[str, Any]]:
+    """LLM 응답 → {req_id: 판정}. 호출 실패이거나 schema에 맞는 판정을 하나도 못 꺼내면 None.
+
+    <think> 블록/뒤에 붙은 텍스트는 무시하고, 응답이 잘렸으면 완결된 판정까지만 살린다.
+    """
+    if isinstance(resp, Exception):
+        return None
+    verdicts = parse_items(getattr(resp, "content", None), "per_requirement", RequirementVerdict)
+    return verdicts_by_id(verdicts) if verdicts else None
+
+def _failed_verdict(req: dict) -> Dict[str, Any]:
+    return {
+        "status": "unclear",
+        "matched_tc_ids": [],
+        "gaps": [],
+        "notes": "LLM 응답을 해석하지 못함 (재시도/분할 후에도 실패)",
+        "confidence": 0.0,
+        "source": "error",
+    }
+
+class _RetryQueue:
+    """batch 결과에서 빠졌거나 confidence가 낮은 requirement만 골라 더 작은 sub-batch로 다시 보낸다.
+
+    - 응답 자체가 실패한 batch: 같은 batch로 max_retries번 재시도
+    - 일부 판정이 빠진 batch: 빠진 requirement만 절반 크기 sub-batch로 재질의
+    - confidence < min_confidence: 한 번만 절반 크기 sub-batch로 재질의하고 더 높은 쪽을 씀
+    - 재시도를 다 써도 안 되면 반으로 나눠서 다시, 1개짜리까지 실패하면 unresolved로 남김
+    확정된 판정은 끝나는 대로 on_done(batch, per_req)로 넘긴다. (sync / async 실행이 같이 씀)
+    """
+
+    def __init__(self, req_batches: List[List[dict]], max_retries: int, on_done,
+                 model: str, min_confidence: float = 0.0):
+        self.stats = {"calls": 0, "retries": 0, "splits": 0, "requeried": 0}
+        self.queue = [(batch, 0) for batch in req_batches]
+        self.max_retries = max_retries
+        self.on_done = on_done
+        self.model = model
+        self.min_confidence = min_confidence
+        self.best: Dict[str, Dict[str, Any]] = {}  # 아직 확정 안 된 (낮은 confidence) 판정
+        self.unresolved: List[dict] = []
+        self._requeried: set = set()
+        self._next: List[Any] = []
+
+    def start_round(self, build_input) -> List[Dict[str, str]]:
+        inputs = [build_input(batch) for batch, _ in self.queue]
+        self.stats["calls"] += len(inputs)
+        return inputs
+
+    def handle(self, i: int, resp: Any) -> None:
+        batch, attempt = self.queue[i]
+        per_req = _parse_eval(resp)
+        if per_req is None:
+            self._requeue(batch, attempt, same_batch=True)
+            return
+
+        accepted: Dict[str, Any] = {}
+        retry: List[dict] = []
+        for r in batch:
+            rid = r["req_id"]
+            verdict = per_req.get(rid)
+            if verdict is None:
+                retry.append(r)
+                continue
+            verdict = {**verdict, "model": self.model}
+            prev = self.best.get(rid)
+            if prev is not None and prev["confidence"] >= verdict["confidence"]:
+                verdict = prev
+            if verdict["confidence"] >= self.min_confidence:
+                accepted[rid] = verdict
+            elif rid not in self._requeried:
+                # 낮은 confidence: 임시로 들고 있다가 작은 batch로 한 번 더 물어봄
+                self.best[rid] = verdict
+                self._requeried.add(rid)
+                self.stats["requeried"] += 1
+                retry.append(r)
+            else:
+                # 재질의 후에도 낮으면 더 묻지 않고 unresolved로 (fallback 모델 대상)
+                self.best[rid] = verdict
+                self.unresolved.append(r)
+
+        done = [r for r in batch if r["req_id"] in accepted]
+        if done:
+            for r in done:
+                self.best.pop(r["req_id"], None)
+            self.on_done(done, accepted)
+        if retry:
+            self._requeue(retry, attempt, same_batch=False)
+
+    def _requeue(self, batch: List[dict], attempt: int, same_batch: bool) -> None:
+        if attempt < self.max_retries:
+            self.stats["retries"] += 1
+            size = len(batch) if same_batch else max(1, (len(batch) + 1) // 2)
+            self._next += [(batch[i:i + size], attempt + 1) for i in range(0, len(batch), size)]
+        elif len(batch) > 1:
+            self.stats["splits"] += 1
+            mid = len(batch) // 2
+            self._next += [(batch[:mid], 0), (batch[mid:], 0)]
+        else:
+            self.unresolved.append(batch[0])
+
+    def end_round(self) -> None:
+        self.queue, self._next = self._next, []
+
+    def pending(self) -> List[dict]:
+        """끝까지 확정 못 한 requirement (판정 없음 + 재질의 후에도 confidence 낮음)."""
+        return self.unresolved
+
+def _run_batches(chain, rq: _RetryQueue, build_input, max_concurrency: int) -> Dict[str, Any]:
+    """queue의 batch들을 동시에 실행하고, 끝나는 대로 rq.handle로 넘긴다 (재질의가 없을 때까지 반복)."""
+    while rq.queue:
+        for i, resp in chain.batch_as_completed(
+            rq.start_round(build_input),
+            config={"max_concurrency": max_concurrency, "metadata": submit_metadata()},
+            return_exceptions=True,
+        ):
+            rq.handle(i, resp)
+        rq.end_round()
+    return rq.stats
+
+async def _arun_batches(chain, rq: _RetryQueue, build_input, max_concurrency: int) -> Dict[str, Any]:
+    """_run_batches의 async 버전 (스레드 없이 이벤트 루프에서 max_concurrency개씩 호출)."""
+    while rq.queue:
+        async for i, resp in chain.abatch_as_completed(
+            rq.start_round(build_input),
+            config={"max_concurrency": max_concurrency, "metadata": submit_metadata()},
+            return_exceptions=True,
+        ):
+            rq.handle(i, resp)
+        rq.end_round()
+    return rq.stats
+
+def _fallback_llm(llm, model: str):
+    # 같은 client 설정(host, temperature 등)에 모델 이름만 바꿔서 사용. 안 되면 get_llm으로 새로 만듦
+    if "model" in getattr(type(llm), "model_fields", {}):
+        return llm.model_copy(update={"model": model})
+    from ..llm import get_llm  # langchain_ollama는 필요할 때만 import
 
-    batch_size = int(state.get("batch_size", 10))  # 기본 10개
-    tc_by_id = _index_testcases(tcs)
+    return get_llm(model=model)
+
+def _evaluate_steps(state: CoverageState, llm) -> Steps:
+    corpus = get_corpus(state)
+    reqs_all = corpus.requirements
+
+    batch_size = int(state.get("batch_size", 10))  # batch당 최대 requirement 수 (기본 10개)
+    # batch당 프롬프트 토큰 예산 (requirements + 매핑된 TC + 시스템 프롬프트)
+    max_batch_tokens = int(state.get("max_batch_tokens", DEFAULT_MAX_BATCH_TOKENS))
+    # 동시에 LLM 서버로 보낼 batch 수 (1이면 기존처럼 순차 실행)
+    max_concurrency = max(1, int(state.get("max_concurrency", 1)))
+    # 이 값보다 confidence가 낮은 판정은 확정으로 보지 않음 (재질의 / incremental carry-forward 제외)
+    min_confidence = float(state.get("min_confidence", DEFAULT_MIN_CONFIDENCE))
 
     merged_per_req: Dict[str, Any] = {}
 
-    # requirements를 batch로 나눠서 평가
-    for req_batch in _chunk(reqs_all, batch_size):
-        # batch에 포함된 requirement들에 매핑된 testcase만 추려서 LLM에 제공 (토큰 절약)
-        used_tc_ids = set()
-        mapping_batch = {}
-        for r in req_batch:
+    # suggest_candidates가 찾은 후보 TC (embeddings 없이 실행하면 비어 있음)
+    candidates: Dict[str, List[str]] = {
+        rid: [c["tc_id"] for c in found]
+        for rid, found in (state.get("candidate_tcs") or {}).items()
+    }
+
+    prompt, model = prompt_text(EVAL_PROMPT), model_name(llm)
+    evaluator = evaluator_fingerprint(prompt, model)
+
+    # --- incremental 모드: dirty가 아닌 requirement는 이전 판정을 그대로 가져감 ---
+    dirty = state.get("dirty_requirements")
+    if dirty is not None and state.get("previous_per_requirement"):
+        # 프롬프트나 모델이 바뀌었으면 입력이 그대로여도 이전 판정은 쓰지 않음
+        changed = evaluator_changed(state.get("previous_evaluator"), evaluator)
+        if changed:
+            dirty = {r["req_id"]: dirty.get(r["req_id"], changed) for r in reqs_all}
+    pending: List[dict] = reqs_all
+    # 재평가 대상과 이유 (incremental이 아니면 전체가 full_run)
+    reevaluated: Dict[str, str] = {r["req_id"]: "full_run" for r in reqs_all}
+    if dirty is not None:
+        previous = state.get("previous_per_requirement", {})
+        pending, reevaluated = [], {}
+        for r in reqs_all:
             rid = r["req_id"]
-            tc_ids = mapping.get(rid, [])
-            mapping_batch[rid] = tc_ids
-            for tc_id in tc_ids:
-                used_tc_ids.add(tc_id)
+            if rid not in dirty and rid in previous:
+                # 입력은 그대로여도 후보 TC가 달라졌으면 다시 평가
+                if previous[rid].get("candidate_tc_ids", []) != candidates.get(rid, []):
+                    pending.append(r)
+                    reevaluated[rid] = "candidates_changed"
+                # 지난 실행에서 실패했거나 확신이 낮았던 판정은 가져오지 않고 다시 평가
+                elif previous[rid].get("source") == "error":
+                    pending.append(r)
+                    reevaluated[rid] = "previous_error"
+                elif float(previous[rid].get("confidence", 0.0)) < min_confidence:
+                    pending.append(r)
+                    reevaluated[rid] = "low_confidence"
+                else:
+                    merged_per_req[rid] = previous[rid]
+            else:
+                pending.append(r)
+                reevaluated[rid] = dirty.get(rid, "no_previous_verdict")
+
+    # --- 규칙 기반 사전 판정: 매핑이 없거나 매핑 TC가 모두 없는 경우는 LLM 없이 확정 (후보 TC가 있으면 제외) ---
+    rule_settled, pending = preclassify(pending, corpus.mapping, corpus.tc_by_id, candidates)
+    merged_per_req.update(rule_settled)
+
+    # requirement별 입력 key (캐시와 journal이 같이 씀)
+    req_keys: Dict[str, str] = {
+        r["req_id"]: _verdict_cache_key(r["req_id"], corpus, candidates.get(r["req_id"], []), prompt, model)
+        for r in pending
+    }
+
+    # --- 캐시 조회: 입력이 바뀌지 않은 requirement는 LLM에 보내지 않음 ---
+    cache = open_cache(state, "verdict")
+    if cache is not None:
+        cached = cache.get_many(req_keys[r["req_id"]] for r in pending)
+        to_evaluate = []
+        for r in pending:
+            rid = r["req_id"]
+            # min_confidence를 올렸으면 예전에 캐시된 낮은 판정은 다시 평가
+            hit = cached.get(req_keys[rid])
+            if hit is not None and float(hit.get("confidence", 0.0)) >= min_confidence:
+                merged_per_req[rid] = hit
+            else:
+                to_evaluate.append(r)
+        pending = to_evaluate
+
+    # --- journal: 확정된 판정을 requirement 단위로 바로 디스크에 남겨서, 재시작 시 건너뜀 ---
+    # (batch 단위 key면 나뉜 sub-batch나 일부만 확정된 batch는 재시작 때 맞는 key가 없음)
+    journal = LLMCache(
+        path=str(Path(state.get("output_dir", "outputs")) / "eval_journal.sqlite"),
+        namespace="requirement", max_entries=None, max_age_days=None,
+    )
+    journaled = journal.get_many(req_keys[r["req_id"]] for r in pending)
+    written_keys = set(journaled)
+    resumed = 0
+    to_evaluate = []
+    for r in pending:
+        rid = r["req_id"]
+        if req_keys[rid] in journaled:
+            merged_per_req[rid] = journaled[req_keys[rid]]
+            resumed += 1
+        else:
+            to_evaluate.append(r)
+    pending = to_evaluate
 
-        used_tcs = [tc_by_id[tc_id] for tc_id in used_tc_ids if tc_id in tc_by_id]
+    # 캐시 / journal에 없는 requirements만 토큰 예산에 맞춰 batch로 나눠서 평가
+    overhead = estimate_tokens(prompt)
+    req_batches = plan_batches(
+        pending, corpus, extra_tcs=candidates,
+        max_tokens=max_batch_tokens, max_items=batch_size, overhead_tokens=overhead,
+    )
+    progress = {"batches": 0, "requirements": 0}
 
-        resp = (EVAL_PROMPT | llm).invoke({
-            "requirements": json.dumps(req_batch, ensure_ascii=False),
-            "testcases": json.dumps(used_tcs, ensure_ascii=False),
-            "mapping": json.dumps(mapping_batch, ensure_ascii=False),
-        }).content
+    def on_done(req_batch: List[dict], per_req: Dict[str, Any]):
+        # 이 batch에 실제로 포함된 requirement의 판정만 반영
+        done = {r["req_id"]: per_req[r["req_id"]] for r in req_batch if r["req_id"] in per_req}
+        merged_per_req.update(done)
+        journal.put_many((req_keys[rid], info) for rid, info in done.items())
+        written_keys.update(req_keys[rid] for rid in done)
+        if cache is not None:
+            # 낮은 confidence 판정(재질의 후에도 낮아서 그대로 쓴 것)은 다음 실행에서 다시 묻도록 캐시하지 않음
+            cache.put_many(
+                (req_keys[rid], info) for rid, info in done.items()
+                if float(info.get("confidence", 0.0)) >= min_confidence
+            )
+        # astream(stream_mode="custom")으로 보는 클라이언트에 batch 단위 진행 상황 전달
+        progress["batches"] += 1
+        progress["requirements"] += len(req_batch)
+        emit_progress({
+            "event": "evaluate_batch_done",
+            "batches_done": progress["batches"],
+            "batches_total": len(req_batches),
+            "requirements_done": progress["requirements"],
+            "requirements_total": sum(len(b) for b in req_batches),
+        })
 
-        result: Dict[str, Any] = json.loads(resp)
-        per_req = result.get("per_requirement", {})
+    # batch_as_completed()는 max_concurrency 만큼만 동시에 호출한다.
+    # 끝나는 순서는 제각각이지만 merge 후 requirements 순서로 다시 정렬하므로 결과는 결정적
+    build_input = lambda b: _build_batch_input(b, corpus, candidates)
+    max_retries = int(state.get("max_retries", 1))
+    primary = _RetryQueue(req_batches, max_retries, on_done, model, min_confidence)
+    chain = EVAL_PROMPT | constrain(llm, EvalResponse)
+    yield LLMStep(
+        run=lambda: _run_batches(chain, primary, build_input, max_concurrency),
+        arun=lambda: _arun_batches(chain, primary, build_input, max_concurrency),
+    )
+    run_stats = {**primary.stats, "escalated": 0, "fallback_calls": 0}
 
-        # batch 결과를 merge
-        merged_per_req.update(per_req)
+    # --- 끝까지 판정이 없거나 confidence가 낮은 requirement는 (설정 시) 더 큰 모델로 다시 평가 ---
+    unresolved = primary.pending()
+    fallback_model = state.get("fallback_model")
+    if unresolved and fallback_model and fallback_model != model:
+        requery_size = max(1, int(state.get("requery_batch_size", DEFAULT_REQUERY_BATCH_SIZE)))
+        fallback = _RetryQueue(
+            [unresolved[i:i + requery_size] for i in range(0, len(unresolved), requery_size)],
+            max_retries, on_done, fallback_model,
+        )
+        fb_chain = EVAL_PROMPT | constrain(_fallback_llm(llm, fallback_model), EvalResponse)
+        yield LLMStep(
+            run=lambda: _run_batches(fb_chain, fallback, build_input, max_concurrency),
+            arun=lambda: _arun_batches(fb_chain, fallback, build_input, max_concurrency),
+        )
+        run_stats["escalated"] = len(unresolved)
+        run_stats["fallback_calls"] = fallback.stats["calls"]
+        run_stats["calls"] += fallback.stats["calls"]
+        unresolved = fallback.pending()
+
+    # 그래도 남은 것: 낮은 confidence라도 판정이 있으면 그것을 쓰고, 없으면 실패로 표시
+    failed = []
+    for r in unresolved:
+        rid = r["req_id"]
+        if rid in primary.best:
+            on_done([r], {rid: primary.best[rid]})
+        else:
+            failed.append(r)
+            merged_per_req[rid] = _failed_verdict(r)
+    run_stats["failed"] = failed
+
+    # 노드가 끝까지 성공했으면 이번 실행의 journal은 정리 (판정은 캐시/checkpoint에 남음)
+    journal.delete_many(written_keys)
+    journal.close()
+
+    # 캐시 hit / 신규 평가가 섞여도 requirements 순서로 정렬해 둔다
+    # (후보 TC를 보고 내린 판정에는 후보 목록을 남겨서 다음 incremental 실행에서 비교)
+    merged_per_req = {
+        r["req_id"]: (
+            {**merged_per_req[r["req_id"]], "candidate_tc_ids": candidates[r["req_id"]]}
+            if r["req_id"] in candidates else merged_per_req[r["req_id"]]
+        )
+        for r in reqs_all if r["req_id"] in merged_per_req
+    }
+
+    cache_stats = None
+    if cache is not None:
+        cache.evict()
+        cache_stats = cache.stats()
+        cache.close()
+
+    emit_event("evaluate_stats", {
+        "retries": run_stats["retries"],
+        "splits": run_stats["splits"],
+        "requeried": run_stats["requeried"],
+        "escalated": run_stats["escalated"],
+        "failed": len(run_stats["failed"]),
+        "rule_settled": len(rule_settled),
+        "resumed_requirements": resumed,
+        "cache_hits": cache_stats["hits"] if cache_stats else 0,
+        "cache_misses": cache_stats["misses"] if cache_stats else 0,
+    })
 
     # --- 전체 summary를 우리가 다시 계산 (STRICT) ---
     covered, partial, not_covered, unclear = [], [], [], []
@@ -106,6 +450,9 @@ def evaluate_coverage_llm(state: CoverageState, llm) -> CoverageState:
 
     llm_coverage = {
         "per_requirement": merged_per_req,
+        # 다음 incremental 실행에서 비교할 입력 snapshot
+        "inputs": {**corpus.fingerprints, **evaluator},
+        "reevaluated": reevaluated,
         "summary": {
             "covered": covered,
             "partial": partial,
@@ -113,12 +460,29 @@ def evaluate_coverage_llm(state: CoverageState, llm) -> CoverageState:
             "unclear": unclear,
             "coverage_rate_strict": strict_rate,
             "batch_size": batch_size,
+            "max_concurrency": max_concurrency,
+            "max_batch_tokens": max_batch_tokens,
+            "rule_settled": len(rule_settled),
+            "batches": len(req_batches),
+            "llm_calls": run_stats["calls"],
+            "retries": run_stats["retries"],
+            "splits": run_stats["splits"],
+            "requeried_low_confidence": run_stats["requeried"],
+            "escalated": run_stats["escalated"],
+            "fallback_model": fallback_model,
+            "fallback_calls": run_stats["fallback_calls"],
+            "failed": [r["req_id"] for r in run_stats["failed"]],
+            "resumed_requirements": resumed,
+            "est_prompt_tokens": sum(
+                overhead + estimate_tokens("".join(_build_batch_input(b, corpus, candidates).values()))
+                for b in req_batches
+            ),
+            "cache": cache_stats,
             "total_requirements": total,
         },
     }
 
     return {
-        **state,
         "llm_coverage": llm_coverage,
         "per_requirement_eval": merged_per_req,
         "covered_requirements": covered,
@@ -126,4 +490,10 @@ def evaluate_coverage_llm(state: CoverageState, llm) -> CoverageState:
         "uncovered_requirements": not_covered,
         "unclear_requirements": unclear,
         "coverage_rate_strict": strict_rate,
-    }
\ No newline at end of file
+    }
+
+def evaluate_coverage_llm(state: CoverageState, llm) -> CoverageState:
+    return run_steps(_evaluate_steps(state, llm))
+
+async def aevaluate_coverage_llm(state: CoverageState, llm) -> CoverageState:
+    return await arun_steps(_evaluate_steps(state, llm))
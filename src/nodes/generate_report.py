@@ -1,32 +1,45 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from langchain_core.prompts import ChatPromptTemplate
+from ..cache import model_name, open_cache, prompt_text, stable_hash
+from ..corpus import get_corpus
+from ..exports import DEFAULT_EXPORT_FORMATS, write_status_table
+from ..history import DEFAULT_CONFIDENCE_DROP, HISTORY_FILE, HistoryStore, diff_verdicts, new_run_id
+from ..incremental import SNAPSHOT_FILE
 from ..state import CoverageState
+from ..llm_steps import LLMStep, Steps, arun_steps, run_steps
+from ..schemas import RecommendationItem, RecommendationResponse, constrain, parse_items
+from ..tracing import emit_event, submit_metadata
 
 
+_MAX_LISTED_IDS = 20  # 리포트 표/목록에 나열할 최대 ID 수
+
+# EVAL_PROMPT와 같이 system 메시지는 고정 (요구사항별 입력은 human 메시지로, prefix KV cache 재사용)
 RECOMMEND_PROMPT = ChatPromptTemplate.from_messages([
     ("system",
      "너는 QA 테스트 설계 전문가다.\n"
      "입력으로 Requirement 요약과 gaps 리스트가 주어진다.\n"
      "각 gap을 '추가 테스트케이스 추천 항목'으로 변환하라.\n"
-     "각 항목은 다음 필드를 가진 JSON 배열로만 출력해라(추가 텍스트 금지):\n"
-     "[\n"
-     "  {{\n"
-     '    "title": "...",\n'
-     '    "purpose": "...",\n'
-     '    "suggested_steps": ["...", "..."],\n'
-     '    "expected": "..."\n'
-     "  }}\n"
-     "]\n"
+     "아래 JSON 형식으로만 출력해라(추가 텍스트 금지):\n"
+     "{{\n"
+     '  "items": [\n'
+     "    {{\n"
+     '      "title": "...",\n'
+     '      "purpose": "...",\n'
+     '      "suggested_steps": ["...", "..."],\n'
+     '      "expected": "..."\n'
+     "    }}\n"
+     "  ]\n"
+     "}}\n"
      "규칙:\n"
      "- title은 짧고 명확하게(20~40자)\n"
      "- purpose는 왜 필요한지 한 줄\n"
      "- suggested_steps는 3~6개\n"
      "- expected는 한 줄\n"
-     "- gaps가 비어있으면 [] 출력\n"
+     "- gaps가 비어있으면 items를 []로 출력\n"
      ),
     ("human",
      "REQ: {req_id}\n"
@@ -54,9 +67,240 @@ def _status_emoji(status: str) -> str:
     }.get(status, "❓")
 
 
-def generate_report(state: CoverageState, llm) -> CoverageState:
-    requirements: List[dict] = state["requirements"]
-    req_by_id: Dict[str, dict] = {r["req_id"]: r for r in requirements}
+def _normalize_gaps(gaps: List[Any]) -> List[str]:
+    # 공백/순서/중복만 다른 gaps는 같은 추천 결과를 쓰도록 정규화
+    return sorted({" ".join(str(g).split()) for g in gaps if str(g).strip()})
+
+
+def _parse_recommendations(resp: Any) -> Optional[List[dict]]:
+    """LLM 응답 → 추천 항목 목록. 호출 실패/schema에 맞는 항목이 없으면 None (잘린 응답은 완결된 항목까지)."""
+    if isinstance(resp, Exception):
+        return None
+    items = parse_items(getattr(resp, "content", None), "items", RecommendationItem)
+    return None if items is None else [item.model_dump() for item in items]
+
+
+def _recommend(
+    state: CoverageState,
+    llm,
+    rows_sorted: List[Tuple[str, str, float, str, str]],
+    per_eval: Dict[str, Any],
+    req_by_id: Dict[str, dict],
+) -> Steps:
+    """partial/not_covered 요구사항의 gaps를 추천 TC로 변환한다.
+
+    (title, description, status, 정규화된 gaps)가 같으면 한 번만 호출하고,
+    결과는 캐시에 남겨서 regenerate_report나 다음 실행에서 다시 호출하지 않는다.
+    파싱에 실패한 것만 max_retries번 다시 호출하고, 그래도 실패하면 None(리포트에 실패로 표시)으로 둔다.
+    """
+    recommendations: Dict[str, Optional[List[dict]]] = {}
+    rids_by_key: Dict[str, List[str]] = {}
+    inputs_by_key: Dict[str, Dict[str, str]] = {}
+
+    prompt, model = prompt_text(RECOMMEND_PROMPT), model_name(llm)
+    for rid, status, conf, matched, notes in rows_sorted:
+        if status not in ("partial", "not_covered"):
+            continue
+        gaps = _normalize_gaps(per_eval.get(rid, {}).get("gaps", []) or [])
+
+        # gaps가 없으면 굳이 LLM 호출하지 않음
+        if not gaps:
+            recommendations[rid] = []
+            continue
+
+        req = req_by_id[rid]
+        title, description = req.get("title", ""), req.get("description", "")
+        key = stable_hash(title, description, status, gaps, prompt, model)
+        rids_by_key.setdefault(key, []).append(rid)
+        inputs_by_key.setdefault(key, {
+            "req_id": rid,
+            "title": title,
+            "description": description,
+            "status": status,
+            "gaps": json.dumps(gaps, ensure_ascii=False),
+        })
+
+    cache = open_cache(state, "recommendation")
+    results: Dict[str, Optional[List[dict]]] = cache.get_many(rids_by_key) if cache is not None else {}
+
+    # 캐시에 없는 것만 동시에 호출 (max_concurrency 제한)
+    missing = [key for key in rids_by_key if key not in results]
+    max_concurrency = max(1, int(state.get("max_concurrency", 1)))
+    chain = RECOMMEND_PROMPT | constrain(llm, RecommendationResponse)
+    batch_config = {"max_concurrency": max_concurrency, "metadata": submit_metadata()}
+
+    fresh: List[Tuple[str, List[dict]]] = []
+    calls = retries = 0
+    todo = missing
+    for attempt in range(1 + int(state.get("max_retries", 1))):
+        if not todo:
+            break
+        batch_inputs = [inputs_by_key[key] for key in todo]
+        responses = yield LLMStep(
+            run=lambda: chain.batch(batch_inputs, config=batch_config, return_exceptions=True),
+            arun=lambda: chain.abatch(batch_inputs, config=batch_config, return_exceptions=True),
+        )
+        calls += len(todo)
+        retries += len(todo) if attempt else 0
+        failed = []
+        for key, resp in zip(todo, responses):
+            rec_items = _parse_recommendations(resp)
+            if rec_items is None:
+                failed.append(key)
+                continue
+            results[key] = rec_items
+            fresh.append((key, rec_items))
+        todo = failed
+
+    # 재시도 후에도 실패한 것은 캐시에 남기지 않음 (다음 실행에서 다시 시도)
+    for key in todo:
+        results[key] = None
+
+    if cache is not None:
+        cache.put_many(fresh)
+        cache.evict()
+        cache.close()
+
+    emit_event("recommend_stats", {
+        "cache_hits": len(rids_by_key) - len(missing),
+        "deduped": sum(len(rids) - 1 for rids in rids_by_key.values()),
+        "recommend_calls": calls,  # Tracer가 callback으로 세는 llm_calls와 겹치지 않게
+        "retries": retries,
+        "parse_failures": len(todo),
+    })
+
+    for key, rids in rids_by_key.items():
+        for rid in rids:
+            recommendations[rid] = results[key]
+    return recommendations
+
+
+def _id_list(ids: List[str], limit: int = _MAX_LISTED_IDS) -> str:
+    shown = ", ".join(ids[:limit])
+    return shown + (f" … (+{len(ids) - limit})" if len(ids) > limit else "")
+
+
+def _mapping_section(analytics: Dict[str, Any], req_by_id: Dict[str, dict]) -> List[str]:
+    md: List[str] = ["\n## 5) Mapping Analytics (reverse index)\n"]
+    md.append(f"- Mapped requirements: {analytics['mapped_requirements']} / {len(req_by_id)} "
+              f"(mapping coverage {analytics['coverage_rate'] * 100:.1f}%)\n")
+    md.append(f"- Weak(only 1 TC): {len(analytics['weak_requirements'])}, "
+              f"Over-tested(>=5 TC): {len(analytics['over_tested_requirements'])}\n")
+    md.append(f"- Orphan TCs (mapped to no requirement): {len(analytics['orphan_tcs'])}\n")
+    if analytics["orphan_tcs"]:
+        md.append(f"  - {_id_list(analytics['orphan_tcs'])}\n")
+    md.append(f"- Dangling TC IDs (in mapping, missing from testcases): {len(analytics['dangling_tc_ids'])}\n")
+    if analytics["dangling_tc_ids"]:
+        md.append(f"  - {_id_list(analytics['dangling_tc_ids'])}\n")
+
+    hubs: Dict[str, int] = analytics["hub_tcs"]
+    md.append(f"\n### Hub TCs (mapped to >= {analytics['hub_threshold']} requirements)\n")
+    if hubs:
+        md.append("| TC_ID | Requirements |\n|---|---:|\n")
+        for tc_id, n in list(hubs.items())[:_MAX_LISTED_IDS]:
+            md.append(f"| {tc_id} | {n} |\n")
+    else:
+        md.append("(none)\n")
+
+    # 삭제 시 커버리지를 잃는 requirement가 많은 TC부터
+    sole: Dict[str, List[str]] = analytics["sole_coverage"]
+    md.append("\n### Deletion Impact (requirements covered only by this TC)\n")
+    if sole:
+        md.append("| TC_ID | Loses coverage | Requirements |\n|---|---:|---|\n")
+        for tc_id, rids in list(sole.items())[:_MAX_LISTED_IDS]:
+            md.append(f"| {tc_id} | {len(rids)} | {_id_list(rids, 5)} |\n")
+    else:
+        md.append("(none)\n")
+    return md
+
+
+def _history_section(diff: Optional[Dict[str, Any]], previous: Optional[Dict[str, Any]],
+                     trend: List[Dict[str, Any]], confidence_drop: float) -> List[str]:
+    md: List[str] = ["\n## 7) Changed Since Last Run\n"]
+    if previous is None or diff is None:
+        md.append("(비교할 이전 실행 없음)\n")
+        return md
+
+    started = datetime.fromtimestamp(previous["started_at"]).strftime("%Y-%m-%d %H:%M:%S")
+    md.append(f"- Previous run: `{previous['run_id']}` ({started}, strict {previous['strict_rate'] * 100:.1f}%)\n")
+    md.append(f"- Newly not_covered: {len(diff['newly_not_covered'])}\n")
+    if diff["newly_not_covered"]:
+        md.append(f"  - {_id_list(diff['newly_not_covered'])}\n")
+    md.append(f"- Regressed: {len(diff['regressed'])}, Improved: {len(diff['improved'])}\n")
+    md.append(f"- Added: {len(diff['added'])}, Removed: {len(diff['removed'])}\n")
+
+    if diff["regressed"]:
+        md.append("\n### Regressed Requirements\n")
+        md.append("| REQ_ID | Before | Now |\n|---|---|---|\n")
+        for rid, before, now in diff["regressed"][:_MAX_LISTED_IDS]:
+            md.append(f"| {rid} | {_status_emoji(before)} {before} | {_status_emoji(now)} {now} |\n")
+
+    md.append(f"\n### Confidence Drops (same status, -{confidence_drop:.2f} or more)\n")
+    if diff["confidence_drops"]:
+        md.append("| REQ_ID | Before | Now |\n|---|---:|---:|\n")
+        for rid, before, now in diff["confidence_drops"][:_MAX_LISTED_IDS]:
+            md.append(f"| {rid} | {before:.2f} | {now:.2f} |\n")
+    else:
+        md.append("(none)\n")
+
+    md.append("\n### Strict Coverage Trend\n")
+    md.append("| Run | Started | Strict | Covered | Not Covered |\n|---|---|---:|---:|---:|\n")
+    for r in trend:
+        started = datetime.fromtimestamp(r["started_at"]).strftime("%Y-%m-%d %H:%M")
+        md.append(f"| {r['run_id']} | {started} | {r['strict_rate'] * 100:.1f}% | {r['covered']} | {r['not_covered']} |\n")
+    return md
+
+
+def _record_history(state: CoverageState, llm, out_dir: Path,
+                    rows: List[Tuple[str, str, float, str, str]]) -> List[str]:
+    """이번 run 판정을 history에 기록(같은 run_id면 덮어씀)하고 이전 run과 비교한 리포트 섹션을 만든다."""
+    run_id = state.get("run_id") or new_run_id()
+    project = state.get("project") or out_dir.resolve().name
+    confidence_drop = float(state.get("confidence_drop_threshold", DEFAULT_CONFIDENCE_DROP))
+
+    store = HistoryStore(state.get("history_path") or str(out_dir / HISTORY_FILE))
+    try:
+        current = {rid: (status, conf) for rid, status, conf, _, _ in rows}
+        store.record_run(run_id, project, current, model=model_name(llm))
+        previous = store.previous_run(project, run_id)
+        diff = diff_verdicts(store.verdicts(previous["run_id"]), current, confidence_drop) if previous else None
+        trend = store.trend(project)
+    finally:
+        store.close()
+
+    if diff is not None:
+        emit_event("history_diff", {
+            "run_id": run_id,
+            "previous_run_id": previous["run_id"],
+            **{k: len(v) for k, v in diff.items()},
+        })
+    return _history_section(diff, previous, trend, confidence_drop)
+
+
+def _status_records(
+    rows_sorted: List[Tuple[str, str, float, str, str]],
+    per_eval: Dict[str, Any],
+    req_by_id: Dict[str, dict],
+) -> Iterator[Dict[str, Any]]:
+    for i, (rid, status, conf, _, notes) in enumerate(rows_sorted, start=1):
+        info = per_eval.get(rid, {})
+        yield {
+            "priority": i,
+            "req_id": rid,
+            "title": req_by_id[rid].get("title", ""),
+            "status": status,
+            "confidence": conf,
+            "matched_tc_ids": [str(t) for t in info.get("matched_tc_ids", []) or []],
+            "gaps": [str(g) for g in info.get("gaps", []) or []],
+            "notes": notes,
+            "model": info.get("model") or info.get("source", ""),
+        }
+
+
+def _report_steps(state: CoverageState, llm) -> Steps:
+    corpus = get_corpus(state)
+    requirements: List[dict] = corpus.requirements
+    req_by_id: Dict[str, dict] = corpus.req_by_id
 
     per_eval: Dict[str, Any] = state.get("per_requirement_eval", {})
     strict_rate = state.get("coverage_rate_strict", 0.0)
@@ -95,116 +339,164 @@ def generate_report(state: CoverageState, llm) -> CoverageState:
     rows_sorted = sorted(rows, key=priority_key)
 
     # --- 3) gaps -> 추가 TC 추천 항목 만들기 (partial/not_covered만) ---
-    recommendations: Dict[str, List[dict]] = {}
-
-    for rid, status, conf, matched, notes in rows_sorted:
-        if status not in ("partial", "not_covered"):
-            continue
-        info = per_eval.get(rid, {})
-        gaps = info.get("gaps", []) or []
-        req = req_by_id[rid]
-
-        # gaps가 없으면 굳이 LLM 호출하지 않음
-        if not gaps:
-            recommendations[rid] = []
-            continue
-
-        resp = (RECOMMEND_PROMPT | llm).invoke({
-            "req_id": rid,
-            "title": req.get("title", ""),
-            "description": req.get("description", ""),
-            "status": status,
-            "gaps": json.dumps(gaps, ensure_ascii=False),
-        }).content
-
-        try:
-            rec_items = json.loads(resp)
-            if not isinstance(rec_items, list):
-                rec_items = []
-        except Exception:
-            # JSON 깨졌으면 안전하게 비워두고, raw는 notes에 남길 수도 있음
-            rec_items = []
-
-        recommendations[rid] = rec_items
+    recommendations = yield from _recommend(state, llm, rows_sorted, per_eval, req_by_id)
 
     # --- Markdown 리포트 생성 ---
+    out_dir = Path(state.get("output_dir", "outputs"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report_path = out_dir / "report.md"
+
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    md: List[str] = []
-    md.append("# Requirement Coverage Report (STRICT)\n")
-    md.append(f"- Generated: **{now}**\n")
-    md.append(f"- Strict Coverage(covered only): **{strict_rate * 100:.1f}%**\n")
-    md.append(f"- Covered: {len(covered)} / {len(requirements)}\n")
-    md.append(f"- Partial: {len(partial)} / {len(requirements)}\n")
-    md.append(f"- Not Covered: {len(not_covered)} / {len(requirements)}\n")
-    md.append(f"- Unclear: {len(unclear)} / {len(requirements)}\n")
-
-    # (A) REQ별 status 표
-    md.append("\n## 1) REQ Status Table\n")
-    md.append("| Priority | REQ_ID | Status | Confidence | Matched TC | Notes |\n")
-    md.append("|---:|---|---|---:|---|---|\n")
-    for i, (rid, status, conf, matched, notes) in enumerate(rows_sorted, start=1):
-        emoji = _status_emoji(status)
-        md.append(f"| {i} | {rid} | {emoji} {status} | {conf:.2f} | {matched} | {notes} |\n")
-
-    # (B) 검토 우선순위(낮은 confidence 순 + 위험도 반영)
-    md.append("\n## 2) Review Priority (Low Confidence First)\n")
-    md.append("아래 항목부터 우선 검토를 권장합니다. (status 위험도 + confidence 낮음)\n\n")
-    for i, (rid, status, conf, matched, notes) in enumerate(rows_sorted[:10], start=1):
-        md.append(f"{i}. **{rid}** — `{status}` (confidence={conf:.2f})\n")
-
-    # (C) 추가 TC 추천 항목
-    md.append("\n## 3) Additional TestCase Recommendations (from gaps)\n")
-    md.append("partial / not_covered 요구사항의 gaps를 기반으로 추가 테스트를 추천합니다.\n")
+    # 한 문자열로 모으지 않고 섹션/행 단위로 바로 파일에 씀 (임시 파일에 쓰고 끝나면 교체)
+    # 이전 run 대비 변화 (history에 이번 판정을 기록하면서 계산)
+    history_md = _record_history(state, llm, out_dir, rows) if state.get("use_history", True) else []
+
+    tmp_path = report_path.with_suffix(".md.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        w = f.write
+        w("# Requirement Coverage Report (STRICT)\n")
+        w(f"- Generated: **{now}**\n")
+        w(f"- Strict Coverage(covered only): **{strict_rate * 100:.1f}%**\n")
+        w(f"- Covered: {len(covered)} / {len(requirements)}\n")
+        w(f"- Partial: {len(partial)} / {len(requirements)}\n")
+        w(f"- Not Covered: {len(not_covered)} / {len(requirements)}\n")
+        w(f"- Unclear: {len(unclear)} / {len(requirements)}\n")
+
+        eval_summary = state.get("llm_coverage", {}).get("summary", {})
+        cache_stats = eval_summary.get("cache")
+        if cache_stats:
+            w(
+                f"- LLM Eval Cache: hits={cache_stats['hits']}, misses={cache_stats['misses']} "
+                f"(hit rate {cache_stats['hit_rate'] * 100:.1f}%, LLM calls={eval_summary.get('llm_calls', 0)})\n"
+            )
+        if eval_summary.get("requeried_low_confidence") or eval_summary.get("escalated"):
+            w(
+                f"- Re-queried (low confidence): {eval_summary.get('requeried_low_confidence', 0)}, "
+                f"escalated to `{eval_summary.get('fallback_model') or '-'}`: {eval_summary.get('escalated', 0)}\n"
+            )
+
+        # (A) REQ별 status 표
+        w("\n## 1) REQ Status Table\n")
+        w("| Priority | REQ_ID | Status | Confidence | Matched TC | Notes |\n")
+        w("|---:|---|---|---:|---|---|\n")
+        for i, (rid, status, conf, matched, notes) in enumerate(rows_sorted, start=1):
+            emoji = _status_emoji(status)
+            w(f"| {i} | {rid} | {emoji} {status} | {conf:.2f} | {matched} | {notes} |\n")
+
+        # (B) 검토 우선순위(낮은 confidence 순 + 위험도 반영)
+        w("\n## 2) Review Priority (Low Confidence First)\n")
+        w("아래 항목부터 우선 검토를 권장합니다. (status 위험도 + confidence 낮음)\n\n")
+        for i, (rid, status, conf, matched, notes) in enumerate(rows_sorted[:10], start=1):
+            w(f"{i}. **{rid}** — `{status}` (confidence={conf:.2f})\n")
+
+        # (C) 추가 TC 추천 항목
+        w("\n## 3) Additional TestCase Recommendations (from gaps)\n")
+        w("partial / not_covered 요구사항의 gaps를 기반으로 추가 테스트를 추천합니다.\n")
+
+        for rid, status, conf, matched, notes in rows_sorted:
+            if status not in ("partial", "not_covered"):
+                continue
+
+            req = req_by_id[rid]
+            w(f"\n### {rid} — {req.get('title','')}\n")
+            w(f"- Status: `{status}` (confidence={conf:.2f})\n")
+            w(f"- Currently mapped: {matched}\n")
+
+            info = per_eval.get(rid, {})
+            gaps = info.get("gaps", []) or []
+            if gaps:
+                w("- Identified gaps:\n")
+                for g in gaps:
+                    w(f"  - {g}\n")
+            else:
+                w("- Identified gaps: (none provided)\n")
+
+            recs = recommendations.get(rid, [])
+            if recs is None:
+                w("\n**Suggested additional TCs:** (생성 실패 — LLM 응답을 해석하지 못함, 다음 실행에서 재시도)\n")
+                continue
+            if not recs:
+                w("\n**Suggested additional TCs:** (none)\n")
+                continue
+
+            w("\n**Suggested additional TCs:**\n")
+            for idx, item in enumerate(recs, start=1):
+                title = item.get("title", f"Additional TC {idx}")
+                purpose = item.get("purpose", "")
+                steps = item.get("suggested_steps", [])
+                expected = item.get("expected", "")
+                w(f"\n- **{title}**\n")
+                if purpose:
+                    w(f"  - Purpose: {purpose}\n")
+                if steps:
+                    w("  - Steps:\n")
+                    for s in steps:
+                        w(f"    1. {s}\n")
+                if expected:
+                    w(f"  - Expected: {expected}\n")
+
+        # (D) incremental 실행 시 재평가 대상과 이유
+        reevaluated: Dict[str, str] = state.get("llm_coverage", {}).get("reevaluated", {})
+        if state.get("dirty_requirements") is not None:
+            w("\n## 4) Re-evaluated Requirements (incremental)\n")
+            w(
+                f"입력이 바뀐 {len(reevaluated)}개 요구사항만 다시 평가했고, "
+                f"나머지 {len(requirements) - len(reevaluated)}개는 이전 판정을 유지했습니다.\n\n"
+            )
+            if reevaluated:
+                w("| REQ_ID | Reason |\n")
+                w("|---|---|\n")
+                for rid, reason in reevaluated.items():
+                    w(f"| {rid} | {reason} |\n")
+
+        # (E) 매핑 역인덱스 분석 (LLM 없이 계산, analyze_mapping)
+        analytics: Dict[str, Any] = state.get("mapping_analytics") or {}
+        if analytics:
+            f.writelines(_mapping_section(analytics, req_by_id))
+
+        # (F) embedding 후보 TC 제안
+        candidate_tcs: Dict[str, List[Dict[str, Any]]] = state.get("candidate_tcs") or {}
+        if candidate_tcs:
+            w("\n## 6) Candidate TC Suggestions (embedding)\n")
+            w(
+                "매핑되지 않았거나 약한/partial 요구사항에 대해 텍스트 유사도로 찾은 후보 TC입니다. "
+                "LLM이 검증 근거로 채택한 후보는 ✅로 표시합니다.\n\n"
+            )
+            w("| REQ_ID | Status | Candidates (score) |\n")
+            w("|---|---|---|\n")
+            for rid, found in candidate_tcs.items():
+                info = per_eval.get(rid, {})
+                matched_ids = set(info.get("matched_tc_ids", []) or [])
+                cells = ", ".join(
+                    f"{'✅ ' if c['tc_id'] in matched_ids else ''}{c['tc_id']} ({c['score']:.2f})" for c in found
+                )
+                w(f"| {rid} | {info.get('status', 'unclear')} | {cells} |\n")
+
+        # (G) 이전 run 대비 변화 / strict coverage 추이
+        f.writelines(history_md)
+
+    tmp_path.replace(report_path)
+
+    # 대시보드용 status 표 (markdown 파싱 없이 읽을 수 있게)
+    export_paths = write_status_table(
+        str(out_dir),
+        lambda: _status_records(rows_sorted, per_eval, req_by_id),
+        state.get("export_formats", DEFAULT_EXPORT_FORMATS),
+    )
 
-    for rid, status, conf, matched, notes in rows_sorted:
-        if status not in ("partial", "not_covered"):
-            continue
+    # 디버깅/추적용 JSON도 저장 (다음 incremental 실행의 비교 기준이기도 함)
+    # 대규모 corpus에서 커지지 않게 indent 없이 파일로 바로 직렬화
+    with (out_dir / SNAPSHOT_FILE).open("w", encoding="utf-8") as f:
+        json.dump(state.get("llm_coverage", {}), f, ensure_ascii=False, separators=(",", ":"))
 
-        req = req_by_id[rid]
-        md.append(f"\n### {rid} — {req.get('title','')}\n")
-        md.append(f"- Status: `{status}` (confidence={conf:.2f})\n")
-        md.append(f"- Currently mapped: {matched}\n")
+    emit_event("report_written", {"report_path": str(report_path), "exports": export_paths})
+    return {"report_path": str(report_path), "export_paths": export_paths}
 
-        info = per_eval.get(rid, {})
-        gaps = info.get("gaps", []) or []
-        if gaps:
-            md.append("- Identified gaps:\n")
-            for g in gaps:
-                md.append(f"  - {g}\n")
-        else:
-            md.append("- Identified gaps: (none provided)\n")
-
-        recs = recommendations.get(rid, [])
-        if not recs:
-            md.append("\n**Suggested additional TCs:** (none)\n")
-            continue
 
-        md.append("\n**Suggested additional TCs:**\n")
-        for idx, item in enumerate(recs, start=1):
-            title = item.get("title", f"Additional TC {idx}")
-            purpose = item.get("purpose", "")
-            steps = item.get("suggested_steps", [])
-            expected = item.get("expected", "")
-            md.append(f"\n- **{title}**\n")
-            if purpose:
-                md.append(f"  - Purpose: {purpose}\n")
-            if steps:
-                md.append("  - Steps:\n")
-                for s in steps:
-                    md.append(f"    1. {s}\n")
-            if expected:
-                md.append(f"  - Expected: {expected}\n")
-
-    report_md = "".join(md)
-
-    Path("outputs").mkdir(exist_ok=True)
-    Path("outputs/report.md").write_text(report_md, encoding="utf-8")
-
-    # 디버깅/추적용 JSON도 저장 (원하면 나중에 LangSmith 붙이기 좋음)
-    Path("outputs/coverage_raw.json").write_text(
-        json.dumps(state.get("llm_coverage", {}), ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+def generate_report(state: CoverageState, llm) -> CoverageState:
+    return run_steps(_report_steps(state, llm))
+
 
-    return {**state, "report_md": report_md}
+async def agenerate_report(state: CoverageState, llm) -> CoverageState:
+    return await arun_steps(_report_steps(state, llm))
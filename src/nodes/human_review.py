@@ -1,12 +1,97 @@
+from typing import Any, Dict, List, Optional
+
+from langgraph.types import interrupt
+
 from ..state import CoverageState
+from ..tracing import emit_event
+
+ACTIONS = ("approve", "revise_plan", "regenerate_report")
+REVIEW_SAMPLE_IDS = 20  # interrupt payload에 담을 ID 목록 최대 개수 (나머지는 count로만)
+
+
+def _id_sample(ids: List[str], limit: int = REVIEW_SAMPLE_IDS) -> Dict[str, Any]:
+    return {"count": len(ids), "ids": list(ids[:limit])}
+
+
+def review_payload(state: CoverageState) -> Dict[str, Any]:
+    """reviewer에게 보여줄 요약 (checkpoint에 저장되므로 ID 목록은 앞부분만)."""
+    return {
+        "coverage_rate": state.get("coverage_rate", 0.0),
+        "coverage_rate_strict": state.get("coverage_rate_strict", 0.0),
+        "report_path": state.get("report_path"),
+        "uncovered": _id_sample(state.get("uncovered_requirements", [])),
+        "partial": _id_sample(state.get("partial_requirements", [])),
+        "weak": _id_sample(state.get("weak_requirements", [])),
+        "over_tested": _id_sample(state.get("over_tested_requirements", [])),
+        "actions": list(ACTIONS),
+    }
+
+
+def _parse_decision(answer: Any) -> Optional[Dict[str, str]]:
+    # Command(resume="approve") 또는 Command(resume={"action": "revise_plan", "plan_feedback": "..."})
+    if isinstance(answer, str):
+        answer = {"action": answer}
+    if not isinstance(answer, dict) or answer.get("action") not in ACTIONS:
+        return None
+    decision = {"action": answer["action"]}
+    if answer["action"] == "revise_plan":
+        decision["plan_feedback"] = str(answer.get("plan_feedback", "")).strip()
+    return decision
+
+
+def auto_decision(state: CoverageState) -> Optional[str]:
+    """headless 정책: review_action="approve"면 approve, strict coverage가 auto_approve_threshold 이상이면 approve.
+
+    regenerate_report / revise_plan은 다시 human_review로 돌아오므로 headless로는 받지 않는다 (무한 루프).
+    """
+    action = state.get("review_action")
+    if action:
+        if action != "approve":
+            raise ValueError(f"review_action은 headless로 'approve'만 가능 (받은 값: {action!r})")
+        return action
+    threshold = state.get("auto_approve_threshold")
+    if threshold is not None and state.get("coverage_rate_strict", 0.0) >= float(threshold):
+        return "approve"
+    return None
+
 
 def human_review(state: CoverageState) -> CoverageState:
+    """리포트 검토 후 다음 action을 정한다.
+
+    정책으로 정해지지 않으면 interrupt로 그래프를 멈추고(checkpoint에 저장) 프로세스는 바로 반환한다.
+    reviewer는 나중에 같은 thread_id로 Command(resume=...)를 보내 재개한다.
+    """
+    action = auto_decision(state)
+    if action is not None:
+        # 워커마다 stdout에 찍지 않고 trace에만 남김
+        emit_event("review_auto_decision", {"action": action})
+        return {"action": action}
+
+    payload = review_payload(state)
+    while True:
+        decision = _parse_decision(interrupt(payload))
+        if decision is not None:
+            return decision
+        # 잘못된 resume 값이면 같은 요약으로 다시 멈춤
+        payload = {**payload, "error": f"action must be one of {', '.join(ACTIONS)}"}
+
+
+def prompt_review(payload: Dict[str, Any]) -> Dict[str, str]:
+    """콘솔에서 interrupt payload를 보여주고 resume 값을 입력받는다 (python -m src.main 대화형 실행용)."""
+    def ids(key: str) -> str:
+        part = payload[key]
+        more = part["count"] - len(part["ids"])
+        return f"{part['count']} {part['ids']}" + (f" … (+{more})" if more > 0 else "")
+
     print("\n" + "=" * 60)
     print("[Human Review]")
-    print(f"- Coverage: {state.get('coverage_rate', 0.0) * 100:.1f}%")
-    print(f"- Uncovered: {state.get('uncovered_requirements', [])}")
-    print(f"- Weak(only 1 TC): {state.get('weak_requirements', [])}")
-    print(f"- Over-tested(>=5 TC): {state.get('over_tested_requirements', [])}")
+    print(f"- Coverage: {payload['coverage_rate'] * 100:.1f}% (strict {payload['coverage_rate_strict'] * 100:.1f}%)")
+    print(f"- Report: {payload.get('report_path')}")
+    print(f"- Uncovered: {ids('uncovered')}")
+    print(f"- Weak(only 1 TC): {ids('weak')}")
+    print(f"- Over-tested(>=5 TC): {ids('over_tested')}")
+    if payload.get("error"):
+        print(f"- {payload['error']}")
     print("=" * 60)
 
     print("\nChoose next action:")
@@ -21,10 +106,10 @@ def human_review(state: CoverageState) -> CoverageState:
         print("Invalid input. Please enter 1, 2, or 3.")
 
     if choice == "1":
-        return {**state, "action": "approve"}
+        return {"action": "approve"}
     elif choice == "2":
         feedback = input("플랜을 어떻게 바꾸고 싶어? (한 줄 피드백): ").strip()
-        return {**state, "action": "revise_plan", "plan_feedback": feedback}
+        return {"action": "revise_plan", "plan_feedback": feedback}
     else:
         # 리포트 생성 노드로만 다시 보냄
-        return {**state, "action": "regenerate_report"}
+        return {"action": "regenerate_report"}
@@ -1,11 +1,60 @@
-import json
-from pathlib import Path
+from ..corpus import Corpus, register_corpus
+from ..history import new_run_id
+from ..incremental import compute_dirty, load_previous_snapshot
+from ..loaders import (
+    DEFAULT_MAPPING_PATH,
+    DEFAULT_REQUIREMENTS_PATH,
+    DEFAULT_TESTCASES_PATH,
+    load_corpus,
+)
 from ..state import CoverageState
 
 def load_data(state: CoverageState) -> CoverageState:
-    return {
-        **state,
-        "requirements": json.loads(Path("data/requirements.json").read_text(encoding="utf-8")),
-        "testcases": json.loads(Path("data/testcases.json").read_text(encoding="utf-8")),
-        "req_tc_mapping": json.loads(Path("data/req_tc_mapping.json").read_text(encoding="utf-8")),
+    # CSV / JSON / JSONL export를 행 단위로 읽어서 requirement / testcase dict로 정규화
+    requirements, testcases, req_tc_mapping = load_corpus(
+        requirements_path=state.get("requirements_path") or DEFAULT_REQUIREMENTS_PATH,
+        testcases_path=state.get("testcases_path") or DEFAULT_TESTCASES_PATH,
+        mapping_path=state.get("mapping_path") or DEFAULT_MAPPING_PATH,
+        mapping_column=state.get("mapping_column"),
+    )
+
+    # 인덱스/레코드 hash/JSON 캐시를 가진 corpus를 한 번 만들어 프로세스 내에서 공유
+    corpus = register_corpus(Corpus(requirements, testcases, req_tc_mapping))
+    fingerprints = corpus.fingerprints
+
+    # ✅ incremental 모드: 이전 실행(coverage_raw.json)과 비교해서 바뀐 requirement만 다시 평가
+    dirty = None
+    previous_per_req = {}
+    previous_evaluator = None
+    if state.get("incremental"):
+        previous = load_previous_snapshot(state.get("output_dir", "outputs"))
+        dirty = compute_dirty(fingerprints, previous)
+        if previous is not None:
+            previous_per_req = {
+                rid: verdict
+                for rid, verdict in previous.get("per_requirement", {}).items()
+                if rid in fingerprints["requirements"] and rid not in dirty
+            }
+            # 프롬프트 / 모델 비교는 LLM을 아는 evaluate_coverage에서
+            inputs = previous["inputs"]
+            previous_evaluator = {"prompt": inputs.get("prompt"), "model": inputs.get("model")}
+
+    update = {
+        # 데이터를 새로 읽을 때마다 새 run (regenerate_report는 같은 run을 history에 덮어씀)
+        "run_id": new_run_id(),
+        "dirty_requirements": dirty,
+        "previous_per_requirement": previous_per_req,
+        "previous_evaluator": previous_evaluator,
     }
+
+    # corpus가 이전에 읽은 것과 같으면(revise_plan 루프 등) 큰 목록은 다시 쓰지 않음
+    # → 해당 채널 버전이 그대로라 checkpoint에도 다시 저장되지 않는다
+    if corpus.corpus_id != state.get("corpus_id"):
+        update.update({
+            "corpus_id": corpus.corpus_id,
+            "requirements": requirements,
+            "testcases": testcases,
+            "req_tc_mapping": req_tc_mapping,
+            "input_fingerprints": fingerprints,
+        })
+    return update
@@ -1,5 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate
 
+from ..llm_steps import LLMStep, Steps, arun_steps, run_steps
+
 PLAN_PROMPT = ChatPromptTemplate.from_messages([
     ("system",
      "너는 QA 커버리지 분석 워크플로우 플래너다.\n"
@@ -12,16 +14,21 @@ PLAN_PROMPT = ChatPromptTemplate.from_messages([
      "사람 피드백:\n{feedback}")
 ])
 
-def plan_node(state, llm):
+def _plan_steps(state, llm) -> Steps:
     objective = state.get("objective", "")
     current_plan = state.get("plan", [])
     feedback = state.get("plan_feedback", "없음")
 
-    plan_text = (PLAN_PROMPT | llm).invoke({
+    inputs = {
         "objective": objective,
         "current_plan": "\n".join(current_plan),
         "feedback": feedback,
-    }).content
+    }
+    chain = PLAN_PROMPT | llm
+    plan_text = (yield LLMStep(
+        run=lambda: chain.invoke(inputs),
+        arun=lambda: chain.ainvoke(inputs),
+    )).content
 
     new_plan = [
         line.strip("- ").strip()
@@ -30,7 +37,12 @@ def plan_node(state, llm):
     ]
 
     return {
-        **state,
         "plan": new_plan,
         "plan_feedback": None,  # 한번 쓰고 비워도 좋음
     }
+
+def plan_node(state, llm):
+    return run_steps(_plan_steps(state, llm))
+
+async def aplan_node(state, llm):
+    return await arun_steps(_plan_steps(state, llm))
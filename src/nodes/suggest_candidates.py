@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ..corpus import Corpus, get_corpus
+from ..embeddings import (
+    DEFAULT_EMBEDDING_PATH,
+    INDEX_FILE,
+    EmbeddingStore,
+    VectorIndex,
+    embed_texts,
+    embedding_model_name,
+    index_signature,
+    text_key,
+)
+from ..state import CoverageState
+from ..tracing import emit_event
+
+DEFAULT_CANDIDATE_K = 3
+DEFAULT_CANDIDATE_MIN_SCORE = 0.3
+DEFAULT_N_PROBE = 8
+
+
+def _req_text(req: dict) -> str:
+    return f"{req.get('title', '')}\n{req.get('description', '')}"
+
+
+def _tc_text(tc: dict) -> str:
+    steps = tc.get("steps") or []
+    if isinstance(steps, list):
+        steps = "\n".join(str(s) for s in steps)
+    return f"{tc.get('title', '')}\n{steps}\n{tc.get('expected', '')}"
+
+
+def _targets(state: CoverageState, corpus: Corpus) -> List[str]:
+    """후보를 찾을 requirement: 매핑이 없거나(존재하는 TC 기준) 약하거나, 이전 판정이 partial인 것."""
+    weak = set((state.get("mapping_analytics") or {}).get("weak_requirements", []))
+    previous = {**state.get("previous_per_requirement", {}), **state.get("per_requirement_eval", {})}
+    return [
+        rid for rid in corpus.req_ids
+        if not corpus.known_tc_ids(rid)
+        or rid in weak
+        or previous.get(rid, {}).get("status") == "partial"
+    ]
+
+
+def suggest_candidates(state: CoverageState, embeddings) -> CoverageState:
+    """embedding 근사 최근접 탐색으로 매핑되지 않은 후보 TC를 top-k개씩 제안한다."""
+    k = int(state.get("candidate_k", DEFAULT_CANDIDATE_K))
+    corpus = get_corpus(state)
+    targets = _targets(state, corpus) if k > 0 else []
+    if not targets or not corpus.testcases:
+        return {"candidate_tcs": {}}
+
+    min_score = float(state.get("candidate_min_score", DEFAULT_CANDIDATE_MIN_SCORE))
+    cache_path = state.get("embedding_cache_path") or DEFAULT_EMBEDDING_PATH
+    model = embedding_model_name(embeddings)
+    store = EmbeddingStore(path=cache_path, model=model)
+
+    # 후보 제안은 참고용이라 embedding 모델이 없거나(pull 안 됨) 응답이 없어도 나머지 평가는 계속
+    try:
+        # TC 벡터(공유 저장소) + index(프로젝트 output_dir)는 텍스트가 그대로면 디스크에서 재사용
+        tc_texts = [_tc_text(tc) for tc in corpus.testcases]
+        tc_vectors = embed_texts(embeddings, store, tc_texts)
+        index = VectorIndex.load_or_build(
+            str(Path(state.get("output_dir", "outputs")) / INDEX_FILE),
+            index_signature(model, [text_key(t) for t in tc_texts]),
+            tc_vectors,
+        )
+        queries = embed_texts(embeddings, store, [_req_text(corpus.req_by_id[rid]) for rid in targets])
+    except Exception as e:
+        print(f"[suggest_candidates] embedding 실패, 후보 TC 제안 생략: {e!r}", file=sys.stderr)
+        emit_event("candidate_error", {"model": model, "error": repr(e)})
+        return {"candidate_tcs": {}}
+    finally:
+        embed_stats = {"embedding_hits": store.hits, "embedding_misses": store.misses}
+        store.close()
+
+    # 이미 매핑된 TC는 빼고 top-k를 채우기 위해 여유 있게 검색
+    extra = max((len(corpus.mapped_tc_ids(rid)) for rid in targets), default=0)
+    hits = index.search(queries, k + extra, n_probe=int(state.get("candidate_n_probe", DEFAULT_N_PROBE)))
+
+    candidates: Dict[str, List[Dict[str, Any]]] = {}
+    for rid, found in zip(targets, hits):
+        mapped = set(corpus.mapped_tc_ids(rid))
+        picked = [
+            {"tc_id": corpus.tc_ids[row], "score": round(score, 3)}
+            for row, score in found
+            if score >= min_score and corpus.tc_ids[row] not in mapped
+        ][:k]
+        if picked:
+            candidates[rid] = picked
+
+    emit_event("candidate_stats", {
+        "targets": len(targets),
+        "with_candidates": len(candidates),
+        **embed_stats,
+    })
+    return {"candidate_tcs": candidates}
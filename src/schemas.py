@@ -0,0 +1,96 @@
+import json
+import re
+from typing import Any, Dict, Iterator, List, Literal, Optional, Type
+
+from pydantic import BaseModel, Field, ValidationError
+
+Status = Literal["covered", "partial", "not_covered", "unclear"]
+
+_THINK = re.compile(r"<think>.*?(</think>|$)", re.S)
+_DECODER = json.JSONDecoder()
+
+
+class RequirementVerdict(BaseModel):
+    req_id: str
+    status: Status
+    matched_tc_ids: List[str] = Field(default_factory=list)
+    gaps: List[str] = Field(default_factory=list)
+    notes: str = ""
+    confidence: float = Field(default=0.0, ge=0.0, le=1.0)
+
+
+class EvalResponse(BaseModel):
+    # requirement ID를 key로 쓰는 dict는 JSON schema로 강제하기 어려워서 list로 받음 (summary는 노드가 다시 계산)
+    per_requirement: List[RequirementVerdict]
+
+
+class RecommendationItem(BaseModel):
+    title: str
+    purpose: str = ""
+    suggested_steps: List[str] = Field(default_factory=list)
+    expected: str = ""
+
+
+class RecommendationResponse(BaseModel):
+    items: List[RecommendationItem]
+
+
+def constrain(llm, schema: Type[BaseModel]):
+    """Ollama chat model이면 응답을 JSON schema로 제한(format)한다. 다른 모델은 그대로 (프롬프트 + tolerant 파서로 처리)."""
+    try:
+        from langchain_ollama import ChatOllama
+    except ImportError:
+        return llm
+    return llm.bind(format=schema.model_json_schema()) if isinstance(llm, ChatOllama) else llm
+
+
+def _strip(text: str) -> str:
+    # qwen3 <think> 블록(닫히지 않은 것 포함)과 코드펜스 제거
+    return _THINK.sub("", text).replace("```json", "").replace("```", "")
+
+
+def iter_json_items(text: str, key: str) -> Iterator[Any]:
+    """text 안의 {"<key>": [ ... ]} 배열 원소를 앞에서부터 하나씩 꺼낸다.
+
+    응답이 중간에 잘렸거나 뒤에 잡다한 텍스트가 붙어 있어도 완결된 원소까지는 돌려준다.
+    """
+    text = _strip(text)
+    m = re.search(r'"%s"\s*:\s*\[' % re.escape(key), text)
+    if m is None:
+        return
+    pos = m.end()
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text) or text[pos] == "]":
+            return
+        try:
+            item, pos = _DECODER.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            return
+        yield item
+
+
+def parse_items(text: str, key: str, model: Type[BaseModel]) -> Optional[List[BaseModel]]:
+    """key 배열의 원소 중 schema에 맞는 것만 model로.
+
+    맞는 원소가 하나도 없으면 None, 응답이 완결된 빈 배열이면 [].
+    """
+    if not isinstance(text, str):
+        return None
+    items: List[BaseModel] = []
+    found = False
+    for raw in iter_json_items(text, key):
+        found = True
+        try:
+            items.append(model.model_validate(raw))
+        except ValidationError:
+            continue
+    if items or found:
+        return items or None
+    return [] if re.search(r'"%s"\s*:\s*\[\s*\]' % re.escape(key), _strip(text)) else None
+
+
+def verdicts_by_id(verdicts: List[RequirementVerdict]) -> Dict[str, Dict[str, Any]]:
+    """list 응답 → 기존 per_requirement 형태 {req_id: {...}}."""
+    return {v.req_id: v.model_dump(exclude={"req_id"}) for v in verdicts}
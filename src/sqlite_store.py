@@ -0,0 +1,30 @@
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+# SQLite 기본 변수 개수 제한(구버전 999)보다 작게 나눠서 IN (...) 조회
+MAX_IN_PARAMS = 500
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """캐시 / checkpoint / embedding / history 저장소가 같이 쓰는 SQLite 연결.
+
+    batch_runner 워커 프로세스들이 같은 파일을 동시에 쓰므로 WAL(읽기가 쓰기를 막지 않음)로 열고
+    lock 대기 시간을 넉넉히 둔다. 연결은 저장소 객체가 자기 lock으로 감싸서 스레드 간에 공유한다.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def select_in(conn: sqlite3.Connection, sql: str, params: Sequence[Any], keys: Iterable[Any]) -> Iterator[tuple]:
+    """sql의 "{marks}" 자리에 keys를 MAX_IN_PARAMS개씩 나눠 넣어 실행하고 행을 차례로 돌려준다.
+
+    예: select_in(conn, "SELECT key, value FROM t WHERE ns = ? AND key IN ({marks})", [ns], keys)
+    params는 keys 앞에 붙는 고정 인자.
+    """
+    keys = list(keys)
+    for i in range(0, len(keys), MAX_IN_PARAMS):
+        part = keys[i:i + MAX_IN_PARAMS]
+        yield from conn.execute(sql.format(marks=",".join("?" * len(part))), [*params, *part]).fetchall()
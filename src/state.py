@@ -1,13 +1,52 @@
-from typing import Dict, List, TypedDict, Any
+from typing import Dict, List, Optional, TypedDict, Any
 
 class CoverageState(TypedDict, total=False):
+    # 노드는 자기가 바꾼 key만 돌려준다 ({**state, ...} 금지).
+    # requirements / testcases / req_tc_mapping은 load_data가 corpus가 바뀌었을 때만 쓴다.
     objective: str
     plan: List[str]
     plan_feedback: str
 
+    # ✅ 입력 경로 (CSV / JSON / JSONL). mapping_column이 있으면 export 컬럼에서 매핑 생성
+    requirements_path: str
+    testcases_path: str
+    mapping_path: str
+    mapping_column: str
+
     requirements: List[dict]
     testcases: List[dict]
     req_tc_mapping: Dict[str, List[str]]
+    input_fingerprints: Dict[str, Any]
+    corpus_id: str  # src/corpus.py 레지스트리 key (인덱스된 Corpus 객체는 state 밖에서 공유)
+
+    # ✅ incremental 모드: 이전 실행 결과와 비교해서 바뀐 requirement만 재평가
+    incremental: bool
+    output_dir: str
+    dirty_requirements: Optional[Dict[str, str]]  # req_id -> 재평가 이유 (None이면 전체 평가)
+    previous_per_requirement: Dict[str, Any]
+    previous_evaluator: Optional[Dict[str, Any]]  # 이전 판정의 {"prompt": hash, "model": 이름}
+
+    # ✅ embedding 후보 TC 제안 (build_graph에 embeddings를 넘겼을 때만 실행)
+    candidate_k: int  # requirement당 후보 TC 수 (0이면 끔)
+    candidate_min_score: float  # cosine 유사도 하한
+    candidate_n_probe: int  # IVF 검색 시 살펴볼 cluster 수
+    embedding_cache_path: str
+    candidate_tcs: Dict[str, List[Dict[str, Any]]]  # req_id -> [{"tc_id", "score"}]
+
+    # ✅ LLM 평가 실행 옵션
+    batch_size: int  # batch당 최대 requirement 수
+    max_batch_tokens: int  # batch당 프롬프트 토큰 예산
+    max_concurrency: int
+    max_retries: int  # 실패한 batch 재시도 횟수 (그래도 실패하면 batch를 반으로 나눔)
+    min_confidence: float  # 이보다 낮은 판정은 더 작은 batch로 한 번 더 물어봄
+    fallback_model: str  # 끝까지 빠지거나 confidence가 낮은 requirement를 다시 평가할 (더 큰) 모델
+    requery_batch_size: int  # fallback 평가 batch 크기
+
+    # ✅ LLM 판정 캐시 옵션 (content hash 기반, SQLite)
+    use_cache: bool
+    cache_path: str
+    cache_max_entries: int
+    cache_max_age_days: float
 
     # ✅ LLM 평가 결과
     llm_coverage: Dict[str, Any]
@@ -19,3 +58,27 @@ class CoverageState(TypedDict, total=False):
     unclear_requirements: List[str]
 
     coverage_rate_strict: float
+
+    # 매핑 개수 기반(비 LLM) 지표 (analyze_mapping)
+    hub_tc_threshold: int  # 이 개수 이상의 requirement에 매핑된 TC를 hub로 표시 (기본 50)
+    mapping_analytics: Dict[str, Any]  # 역인덱스 기반 hub / orphan / 단독 커버 TC 등
+    weak_requirements: List[str]
+    over_tested_requirements: List[str]
+    coverage_rate: float
+
+    # 실행 이력 (history.sqlite) — 이전 run 대비 변화 / strict coverage 추이
+    run_id: str  # load_data가 실행마다 새로 만듦
+    project: str  # history에서 run을 묶는 이름 (기본: output_dir 폴더 이름)
+    history_path: str  # 기본 <output_dir>/history.sqlite (batch_runner는 프로젝트 공용 파일)
+    use_history: bool
+    confidence_drop_threshold: float  # 같은 status에서 이만큼 confidence가 떨어지면 리포트에 표시 (기본 0.2)
+
+    # 리포트는 파일로만 (큰 markdown 문자열을 state / checkpoint에 두지 않음)
+    report_path: str
+    export_formats: List[str]  # status 표 export 형식 (기본 csv / jsonl, parquet은 pyarrow 필요)
+    export_paths: Dict[str, str]  # format → 파일 경로
+
+    # ✅ Human Review
+    action: str  # approve / revise_plan / regenerate_report
+    review_action: str  # "approve"면 interrupt 없이 approve (headless, 다른 action은 루프가 되므로 불가)
+    auto_approve_threshold: float  # strict coverage가 이 값 이상이면 검토 없이 approve (미달이면 interrupt)
@@ -0,0 +1,192 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler, dispatch_custom_event
+from langgraph.config import get_stream_writer
+
+DEFAULT_TRACE_FILE = "trace.jsonl"
+
+
+def submit_metadata() -> Dict[str, Any]:
+    """batch 호출 시 config metadata에 넣어두면, 실제 호출 시작까지의 대기(queue) 시간을 잴 수 있다."""
+    return {"submitted_at": time.time()}
+
+
+def emit_event(name: str, data: Dict[str, Any]) -> None:
+    """노드 안에서 재시도/캐시 hit 같은 지표를 trace로 보낸다 (그래프 밖에서 호출되면 무시)."""
+    try:
+        dispatch_custom_event(name, data)
+    except RuntimeError:
+        pass
+
+
+def emit_progress(data: Dict[str, Any]) -> None:
+    """stream(stream_mode="custom")으로 보는 클라이언트에 진행 상황을 보낸다 (그래프 밖에서 호출되면 무시)."""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer(data)
+
+
+class Tracer(BaseCallbackHandler):
+    """LangSmith 없이 노드 / LLM 호출 단위 타이밍과 토큰 수를 JSONL로 남기는 callback.
+
+    app.invoke(..., config={"callbacks": [tracer]})로 넘기면
+    - 노드: wall time
+    - LLM 호출: wall / queue time, prompt/completion 토큰(Ollama prompt_eval_count/eval_count), payload bytes
+    - emit_event()로 보낸 노드 지표(retries, cache hits 등)
+    를 기록하고, summary_markdown()으로 노드별 요약 표를 만든다.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fp = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._nodes: Dict[UUID, Dict[str, Any]] = {}
+        self._llm: Dict[UUID, Dict[str, Any]] = {}
+        self._summary: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    # --- 기록 ---
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps({"ts": time.time(), **record}, ensure_ascii=False, default=str)
+        with self._lock:
+            self._fp.write(line + "\n")
+            self._fp.flush()
+
+    def _add(self, node: str, **values: float) -> None:
+        with self._lock:
+            for k, v in values.items():
+                self._summary[node][k] += v
+
+    # --- 노드 ---
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # 노드 자체(RunnableCallable)만 기록. 노드 안의 prompt | llm 체인 등은 제외
+        if node and kwargs.get("name") == node:
+            self._nodes[run_id] = {"node": node, "start": time.perf_counter()}
+
+    def _end_node(self, run_id: UUID, error: Optional[BaseException] = None) -> None:
+        info = self._nodes.pop(run_id, None)
+        if info is None:
+            return
+        wall = time.perf_counter() - info["start"]
+        self._add(info["node"], node_runs=1, node_wall_s=wall)
+        self._write({
+            "type": "node",
+            "node": info["node"],
+            "wall_s": round(wall, 4),
+            **({"error": repr(error)} if error else {}),
+        })
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_node(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_node(run_id, error)
+
+    # --- LLM 호출 ---
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        now = time.time()
+        submitted = metadata.get("submitted_at")
+        self._llm[run_id] = {
+            "node": metadata.get("langgraph_node", "(none)"),
+            "start": time.perf_counter(),
+            "queue_s": max(0.0, now - submitted) if submitted else 0.0,
+            "prompt_bytes": sum(len(str(m.content).encode("utf-8")) for batch in messages for m in batch),
+        }
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        info = self._llm.pop(run_id, None)
+        if info is None:
+            return
+        wall = time.perf_counter() - info["start"]
+        prompt_tokens = completion_tokens = completion_bytes = 0
+        for gens in response.generations:
+            for gen in gens:
+                msg = getattr(gen, "message", None)
+                completion_bytes += len(str(gen.text).encode("utf-8"))
+                usage = getattr(msg, "usage_metadata", None) or {}
+                meta = getattr(msg, "response_metadata", None) or {}
+                prompt_tokens += usage.get("input_tokens") or meta.get("prompt_eval_count") or 0
+                completion_tokens += usage.get("output_tokens") or meta.get("eval_count") or 0
+
+        self._add(
+            info["node"],
+            llm_calls=1,
+            llm_wall_s=wall,
+            queue_s=info["queue_s"],
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            prompt_bytes=info["prompt_bytes"],
+            completion_bytes=completion_bytes,
+        )
+        self._write({
+            "type": "llm",
+            "node": info["node"],
+            "wall_s": round(wall, 4),
+            "queue_s": round(info["queue_s"], 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "prompt_bytes": info["prompt_bytes"],
+            "completion_bytes": completion_bytes,
+        })
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        info = self._llm.pop(run_id, None)
+        if info is None:
+            return
+        self._add(info["node"], llm_errors=1)
+        self._write({"type": "llm_error", "node": info["node"], "error": repr(error)})
+
+    # --- 노드가 보낸 지표 ---
+
+    def on_custom_event(self, name: str, data: Any, *, metadata=None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node", "(none)")
+        if isinstance(data, dict):
+            self._add(node, **{k: v for k, v in data.items() if isinstance(v, (int, float))})
+        self._write({"type": "event", "node": node, "name": name, "data": data})
+
+    # --- 요약 ---
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {node: dict(values) for node, values in self._summary.items()}
+
+    def summary_markdown(self) -> str:
+        rows: List[str] = [
+            "\n## Run Trace Summary\n",
+            f"trace: `{self.path}`\n\n",
+            "| Node | Runs | Wall(s) | LLM calls | LLM wall(s) | Avg queue(s) "
+            "| Prompt tok | Completion tok | Prompt KB | Retries | Cache hits |\n",
+            "|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|\n",
+        ]
+        for node, v in self.summary().items():
+            calls = v.get("llm_calls", 0)
+            rows.append(
+                f"| {node} | {int(v.get('node_runs', 0))} | {v.get('node_wall_s', 0):.2f} "
+                f"| {int(calls)} | {v.get('llm_wall_s', 0):.2f} "
+                f"| {(v.get('queue_s', 0) / calls) if calls else 0:.2f} "
+                f"| {int(v.get('prompt_tokens', 0))} | {int(v.get('completion_tokens', 0))} "
+                f"| {v.get('prompt_bytes', 0) / 1024:.1f} | {int(v.get('retries', 0))} "
+                f"| {int(v.get('cache_hits', 0))} |\n"
+            )
+        return "".join(rows)
+
+    def append_summary(self, report_path: str) -> None:
+        with open(report_path, "a", encoding="utf-8") as f:
+            f.write(self.summary_markdown())
+
+    def close(self) -> None:
+        with self._lock:
+            self._fp.close()
@@ -1,33 +1,58 @@
 from pathlib import Path
 
-from .llm import get_llm
-from .graph import build_graph
-
-
-def main():
-    llm = get_llm(model="qwen3:8b", temperature=0.0)
-    app = build_graph(llm)
-
-    # LangGraph 내부 그래프 객체 얻기
-    g = app.get_graph()
-
-    # 1) Mermaid 텍스트로 저장 (가장 확실/가벼움)
-    mermaid = g.draw_mermaid()
-    Path("outputs").mkdir(exist_ok=True)
-    Path("outputs/graph.mmd").write_text(mermaid, encoding="utf-8")
-
-    print("Saved: outputs/graph.mmd")
+from .graph import CANDIDATES_NODE, END, NODES, REVIEW_ROUTES, START, graph_edges
+
+
+def draw_mermaid(with_candidates: bool = True) -> str:
+    """graph.py의 노드 / edge 목록으로 Mermaid를 만든다 (LangGraph draw_mermaid와 같은 모양, langgraph import 없음)."""
+    nodes = list(NODES) + ([CANDIDATES_NODE] if with_candidates else [])
+    edges = [f"\t{src} --> {dst};" for src, dst in graph_edges(with_candidates)]
+    edges += [f"\thuman_review -. &nbsp;{action}&nbsp; .-> {dst};" for action, dst in REVIEW_ROUTES.items()]
+    lines = [
+        "---", "config:", "  flowchart:", "    curve: linear", "---", "graph TD;",
+        f"\t{START}([<p>{START}</p>]):::first",
+        *(f"\t{n}({n})" for n in nodes),
+        f"\t{END}([<p>{END}</p>]):::last",
+        *sorted(edges),
+        "\tclassDef default fill:#f2f0ff,line-height:1.2",
+        "\tclassDef first fill-opacity:0",
+        "\tclassDef last fill:#bfb6fc",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def render_graph(out_path: str = "outputs/graph.mmd", png: bool = True, with_candidates: bool = True) -> None:
+    """그래프 구조를 Mermaid(+ 가능하면 PNG)로 저장한다. LLM client는 만들지 않는다."""
+    # 1) Mermaid 텍스트로 저장 (가장 확실/가벼움, langgraph / langchain import 없이)
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(draw_mermaid(with_candidates), encoding="utf-8")
+    print(f"Saved: {out}")
 
     # 2) (선택) PNG로 저장 시도
-    # mermaid-cli(mmdc) 환경이 있으면 PNG까지 자동 생성 가능
+    # mermaid-cli(mmdc) 환경이 있으면 PNG까지 자동 생성 가능 (이때만 그래프를 compile)
+    if not png:
+        return
     try:
-        png_bytes = g.draw_mermaid_png()
-        Path("outputs/graph.png").write_bytes(png_bytes)
-        print("Saved: outputs/graph.png")
+        from .graph import build_graph
+
+        embeddings = None
+        if with_candidates:
+            # suggest_candidates 노드를 그리기 위한 자리표시 (실행하지 않으므로 embedding 모델 불필요)
+            from .embeddings import HashingEmbeddings
+            embeddings = HashingEmbeddings()
+
+        png_bytes = build_graph(embeddings=embeddings).get_graph().draw_mermaid_png()
+        out.with_suffix(".png").write_bytes(png_bytes)
+        print(f"Saved: {out.with_suffix('.png')}")
     except Exception as e:
         print("PNG export skipped (environment missing).")
         print(f"Reason: {e}")
 
 
+def main():
+    render_graph()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,32 @@
+import os
+import unittest
+from unittest import mock
+
+from src.llm import RoundRobinChatOllama, get_llm, ollama_hosts
+
+
+class OllamaHostsTest(unittest.TestCase):
+    def test_bare_ollama_host_gets_default_port(self):
+        with mock.patch.dict(os.environ, {"OLLAMA_HOST": "10.0.0.5"}, clear=True):
+            self.assertEqual(ollama_hosts(), ["http://10.0.0.5:11434"])
+            llm = get_llm()
+        self.assertEqual(str(llm._client._client.base_url), "http://10.0.0.5:11434")
+
+    def test_bare_host_list(self):
+        with mock.patch.dict(os.environ, {"OLLAMA_HOSTS": "gpu1, gpu2:8000 ,10.0.0.5"}, clear=True):
+            hosts = ollama_hosts()
+            llm = get_llm()
+        self.assertEqual(hosts, ["http://gpu1:11434", "http://gpu2:8000", "http://10.0.0.5:11434"])
+        self.assertIsInstance(llm, RoundRobinChatOllama)
+        self.assertEqual([str(c._client.base_url) for c in llm._clients], hosts)
+
+    def test_explicit_scheme_is_kept(self):
+        self.assertEqual(ollama_hosts("https://ollama.example.com"), ["https://ollama.example.com"])
+
+    def test_empty(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(ollama_hosts(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()